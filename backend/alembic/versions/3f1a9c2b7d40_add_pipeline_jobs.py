@@ -0,0 +1,59 @@
+"""add pipeline jobs and stages
+
+Revision ID: 3f1a9c2b7d40
+Revises: e99760e1d772
+Create Date: 2026-10-18 09:12:04.118532
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3f1a9c2b7d40"
+down_revision = 'e99760e1d772'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pipeline_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("run_month", sa.String(length=7), nullable=False),
+        sa.Column("executed_by", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("source_path", sa.String(length=500), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(op.f("ix_pipeline_jobs_run_month"), "pipeline_jobs", ["run_month"], unique=False)
+
+    op.create_table(
+        "pipeline_stages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("stage", sa.String(length=20), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("detail", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+
+        sa.UniqueConstraint("job_id", "stage", name="uq_pipeline_job_stage"),
+
+        sa.ForeignKeyConstraint(
+            ["job_id"],
+            ["pipeline_jobs.id"],
+            ondelete="CASCADE",
+            name="fk_pipeline_stage_job",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("pipeline_stages")
+    op.drop_index(op.f("ix_pipeline_jobs_run_month"), table_name="pipeline_jobs")
+    op.drop_table("pipeline_jobs")
@@ -0,0 +1,40 @@
+"""add person_key identity across monthly snapshots
+
+Revision ID: 5d7c3e91f2ab
+Revises: 8b52e0d4a6c1
+Create Date: 2026-10-18 11:40:12.906154
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5d7c3e91f2ab"
+down_revision = '8b52e0d4a6c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('employees', sa.Column('person_key', sa.String(length=255), nullable=True))
+    op.add_column('employee_metrics', sa.Column('person_key', sa.String(length=255), nullable=True))
+
+    # Backfill: person_key is the normalized email
+    op.execute("UPDATE employees SET person_key = LOWER(TRIM(email))")
+    op.execute(
+        "UPDATE employee_metrics SET person_key = ("
+        "SELECT e.person_key FROM employees e WHERE e.id = employee_metrics.employee_id"
+        ")"
+    )
+
+    op.create_index(op.f('ix_employees_person_key'), 'employees', ['person_key'], unique=False)
+    op.create_index('ix_employee_metrics_person_month', 'employee_metrics', ['person_key', 'run_month'], unique=False)
+    op.create_index('ix_rollup_department_month', 'department_metric_rollups', ['department', 'run_month'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_rollup_department_month', table_name='department_metric_rollups')
+    op.drop_index('ix_employee_metrics_person_month', table_name='employee_metrics')
+    op.drop_index(op.f('ix_employees_person_key'), table_name='employees')
+    op.drop_column('employee_metrics', 'person_key')
+    op.drop_column('employees', 'person_key')
@@ -0,0 +1,55 @@
+"""add department metric rollups
+
+Revision ID: 8b52e0d4a6c1
+Revises: 3f1a9c2b7d40
+Create Date: 2026-10-18 11:02:47.503318
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8b52e0d4a6c1"
+down_revision = '3f1a9c2b7d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "department_metric_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("run_month", sa.String(length=7), nullable=False),
+        sa.Column("department", sa.String(length=100), nullable=False),
+
+        sa.Column("headcount", sa.Integer(), nullable=False),
+
+        sa.Column("avg_efficiency", sa.Float(), nullable=False),
+        sa.Column("median_efficiency", sa.Float(), nullable=False),
+        sa.Column("p10_efficiency", sa.Float(), nullable=False),
+        sa.Column("p90_efficiency", sa.Float(), nullable=False),
+        sa.Column("avg_hourly_rate", sa.Float(), nullable=False),
+
+        sa.Column("total_base_salary", sa.Float(), nullable=False),
+        sa.Column("total_gross_pay", sa.Float(), nullable=False),
+        sa.Column("total_net_pay", sa.Float(), nullable=False),
+
+        sa.Column("high_value_count", sa.Integer(), nullable=False),
+        sa.Column("star_count", sa.Integer(), nullable=False),
+        sa.Column("overpaid_count", sa.Integer(), nullable=False),
+        sa.Column("underutilized_count", sa.Integer(), nullable=False),
+
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+
+        sa.UniqueConstraint(
+            "run_month", "department", name="uq_rollup_run_department"
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("department_metric_rollups")
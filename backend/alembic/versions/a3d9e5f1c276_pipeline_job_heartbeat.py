@@ -0,0 +1,30 @@
+"""add a heartbeat to pipeline jobs for orphan detection
+
+Revision ID: a3d9e5f1c276
+Revises: f6c2d8e4b153
+Create Date: 2026-10-18 22:15:44.630982
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a3d9e5f1c276"
+down_revision = 'f6c2d8e4b153'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("pipeline_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+    # Last known progress of existing jobs
+    op.execute(
+        "UPDATE pipeline_jobs SET heartbeat_at = COALESCE(finished_at, created_at)"
+    )
+    op.create_index(op.f("ix_pipeline_jobs_heartbeat_at"), "pipeline_jobs", ["heartbeat_at"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_pipeline_jobs_heartbeat_at"), table_name="pipeline_jobs")
+    with op.batch_alter_table("pipeline_jobs") as batch:
+        batch.drop_column("heartbeat_at")
@@ -0,0 +1,28 @@
+"""add (employee_id, year, quarter) index on performance_reviews
+
+Revision ID: a7e4b1c9d352
+Revises: 5d7c3e91f2ab
+Create Date: 2026-10-18 13:05:41.318022
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a7e4b1c9d352"
+down_revision = '5d7c3e91f2ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_performance_reviews_employee_period',
+        'performance_reviews',
+        ['employee_id', 'year', 'quarter'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_performance_reviews_employee_period', table_name='performance_reviews')
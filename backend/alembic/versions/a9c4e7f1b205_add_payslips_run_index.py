@@ -0,0 +1,28 @@
+"""add payslips (payroll_run_id, id) index for run exports
+
+Revision ID: a9c4e7f1b205
+Revises: f3a7d2c9e184
+Create Date: 2026-10-18 17:12:54.810342
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a9c4e7f1b205"
+down_revision = 'f3a7d2c9e184'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_payslips_run',
+        'payslips',
+        ['payroll_run_id', 'id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_payslips_run', table_name='payslips')
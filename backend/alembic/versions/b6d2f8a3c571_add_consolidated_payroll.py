@@ -0,0 +1,37 @@
+"""add consolidated_payroll for base + adjustment run totals
+
+Revision ID: b6d2f8a3c571
+Revises: a9c4e7f1b205
+Create Date: 2026-10-18 18:05:16.392817
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b6d2f8a3c571"
+down_revision = 'a9c4e7f1b205'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing runs are consolidated by their next adjustment run; reads
+    # aggregate their entries until then
+    op.create_table(
+        "consolidated_payroll",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("base_run_id", sa.Integer(), sa.ForeignKey("payroll_runs.id"), nullable=False),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("total_gross", sa.Float(), nullable=False),
+        sa.Column("total_net", sa.Float(), nullable=False),
+        sa.Column("adjustment_count", sa.Integer(), nullable=False),
+        sa.Column("last_run_id", sa.Integer(), sa.ForeignKey("payroll_runs.id"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+
+        sa.UniqueConstraint("base_run_id", "employee_id", name="uq_consolidated_run_employee"),
+    )
+
+
+def downgrade():
+    op.drop_table("consolidated_payroll")
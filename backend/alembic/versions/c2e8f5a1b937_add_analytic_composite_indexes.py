@@ -0,0 +1,44 @@
+"""add composite indexes for hot analytic filters
+
+Revision ID: c2e8f5a1b937
+Revises: a7e4b1c9d352
+Create Date: 2026-10-18 14:22:09.574816
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c2e8f5a1b937"
+down_revision = 'a7e4b1c9d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # employee_metrics filtered by run_month, joined on employee_id;
+    # the scores are included so quadrant/insight reads stay in the index
+    op.create_index(
+        'ix_employee_metrics_month_employee',
+        'employee_metrics',
+        ['run_month', 'employee_id', 'efficiency_score', 'hourly_rate'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_payroll_entries_run_employee',
+        'payroll_entries',
+        ['payroll_run_id', 'employee_id', 'gross_pay', 'net_pay'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_employees_month_department',
+        'employees',
+        ['run_month', 'department'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_employees_month_department', table_name='employees')
+    op.drop_index('ix_payroll_entries_run_employee', table_name='payroll_entries')
+    op.drop_index('ix_employee_metrics_month_employee', table_name='employee_metrics')
@@ -0,0 +1,34 @@
+"""allow NULL metrics for employees with unusable salary or hours
+
+Revision ID: c8e3a5f7d914
+Revises: b6d2f8a3c571
+Create Date: 2026-10-18 19:12:44.108532
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c8e3a5f7d914"
+down_revision = 'b6d2f8a3c571'
+branch_labels = None
+depends_on = None
+
+
+METRIC_COLUMNS = ["hourly_rate", "dept_avg_hourly", "peer_percentile", "efficiency_score"]
+
+
+def upgrade():
+    with op.batch_alter_table("employee_metrics") as batch:
+        for column in METRIC_COLUMNS:
+            batch.alter_column(column, existing_type=sa.Float(), nullable=True)
+
+
+def downgrade():
+    op.execute(
+        "DELETE FROM employee_metrics WHERE "
+        + " OR ".join(f"{column} IS NULL" for column in METRIC_COLUMNS)
+    )
+    with op.batch_alter_table("employee_metrics") as batch:
+        for column in METRIC_COLUMNS:
+            batch.alter_column(column, existing_type=sa.Float(), nullable=False)
@@ -0,0 +1,49 @@
+"""store person_key as a SHA-256 of the normalized email
+
+Revision ID: d2a6f9c4e817
+Revises: c8e3a5f7d914
+Create Date: 2026-10-18 19:40:03.551274
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d2a6f9c4e817"
+down_revision = 'c8e3a5f7d914'
+branch_labels = None
+depends_on = None
+
+
+COPY_TO_METRICS = (
+    "UPDATE employee_metrics SET person_key = ("
+    "SELECT e.person_key FROM employees e WHERE e.id = employee_metrics.employee_id"
+    ")"
+)
+
+
+def upgrade():
+    # Same digest as person_service.person_key_for_email; computed here so
+    # the migration does not depend on application code
+    conn = op.get_bind()
+    keys = [
+        k for (k,) in conn.execute(
+            sa.text("SELECT DISTINCT person_key FROM employees WHERE person_key IS NOT NULL")
+        )
+    ]
+    if keys:
+        conn.execute(
+            sa.text("UPDATE employees SET person_key = :new WHERE person_key = :old"),
+            [
+                {"old": k, "new": hashlib.sha256(k.encode("utf-8")).hexdigest()}
+                for k in keys
+            ],
+        )
+    op.execute(COPY_TO_METRICS)
+
+
+def downgrade():
+    op.execute("UPDATE employees SET person_key = LOWER(TRIM(email))")
+    op.execute(COPY_TO_METRICS)
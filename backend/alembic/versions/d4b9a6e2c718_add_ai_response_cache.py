@@ -0,0 +1,43 @@
+"""add ai_response_cache
+
+Revision ID: d4b9a6e2c718
+Revises: c2e8f5a1b937
+Create Date: 2026-10-18 15:03:47.201395
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d4b9a6e2c718"
+down_revision = 'c2e8f5a1b937'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("run_month", sa.String(length=7), nullable=True),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("temperature", sa.Float(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+
+        sa.UniqueConstraint("cache_key", name="uq_ai_response_cache_key"),
+    )
+    op.create_index("ix_ai_response_cache_last_hit", "ai_response_cache", ["last_hit_at"], unique=False)
+    op.create_index("ix_ai_response_cache_expires", "ai_response_cache", ["expires_at"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_ai_response_cache_expires", table_name="ai_response_cache")
+    op.drop_index("ix_ai_response_cache_last_hit", table_name="ai_response_cache")
+    op.drop_table("ai_response_cache")
@@ -0,0 +1,36 @@
+"""store quadrant per employee metric and per-month cutoffs
+
+Revision ID: e5f1c3a8d260
+Revises: d4b9a6e2c718
+Create Date: 2026-10-18 15:48:30.662041
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e5f1c3a8d260"
+down_revision = 'd4b9a6e2c718'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing months are classified lazily on first read
+    op.add_column('employee_metrics', sa.Column('quadrant', sa.String(length=20), nullable=True))
+
+    op.create_table(
+        "quadrant_cutoffs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("run_month", sa.String(length=7), nullable=False),
+        sa.Column("cost_median", sa.Float(), nullable=False),
+        sa.Column("efficiency_median", sa.Float(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=True),
+
+        sa.UniqueConstraint("run_month", name="uq_quadrant_cutoff_run_month"),
+    )
+
+
+def downgrade():
+    op.drop_table("quadrant_cutoffs")
+    op.drop_column('employee_metrics', 'quadrant')
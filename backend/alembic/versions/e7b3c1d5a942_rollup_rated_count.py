@@ -0,0 +1,42 @@
+"""split rollup headcount into all employees and rated employees
+
+Revision ID: e7b3c1d5a942
+Revises: d2a6f9c4e817
+Create Date: 2026-10-18 21:12:36.184027
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e7b3c1d5a942"
+down_revision = 'd2a6f9c4e817'
+branch_labels = None
+depends_on = None
+
+
+# Existing rows counted only employees with an hourly rate
+RESTORE_STAFFING = (
+    "UPDATE department_metric_rollups SET "
+    "headcount = (SELECT COUNT(*) FROM employees e "
+    "WHERE e.run_month = department_metric_rollups.run_month "
+    "AND e.department = department_metric_rollups.department), "
+    "total_base_salary = (SELECT COALESCE(SUM(e.base_salary), 0) FROM employees e "
+    "WHERE e.run_month = department_metric_rollups.run_month "
+    "AND e.department = department_metric_rollups.department)"
+)
+
+
+def upgrade():
+    op.add_column(
+        "department_metric_rollups",
+        sa.Column("rated_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute("UPDATE department_metric_rollups SET rated_count = headcount")
+    op.execute(RESTORE_STAFFING)
+
+
+def downgrade():
+    op.execute("UPDATE department_metric_rollups SET headcount = rated_count")
+    with op.batch_alter_table("department_metric_rollups") as batch:
+        batch.drop_column("rated_count")
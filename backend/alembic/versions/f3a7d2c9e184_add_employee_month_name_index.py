@@ -0,0 +1,28 @@
+"""add employees (run_month, name) index for payroll entry paging
+
+Revision ID: f3a7d2c9e184
+Revises: e5f1c3a8d260
+Create Date: 2026-10-18 16:41:27.203518
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f3a7d2c9e184"
+down_revision = 'e5f1c3a8d260'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_employees_month_name',
+        'employees',
+        ['run_month', 'name'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_employees_month_name', table_name='employees')
@@ -0,0 +1,29 @@
+"""record the base payroll run written by a pipeline job
+
+Revision ID: f6c2d8e4b153
+Revises: e7b3c1d5a942
+Create Date: 2026-10-18 21:48:19.027615
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f6c2d8e4b153"
+down_revision = 'e7b3c1d5a942'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("pipeline_jobs") as batch:
+        batch.add_column(sa.Column("payroll_run_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_pipeline_jobs_payroll_run", "payroll_runs", ["payroll_run_id"], ["id"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("pipeline_jobs") as batch:
+        batch.drop_constraint("fk_pipeline_jobs_payroll_run", type_="foreignkey")
+        batch.drop_column("payroll_run_id")
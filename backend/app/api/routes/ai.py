@@ -5,6 +5,11 @@ from backend.app.db.session import get_db
 from backend.app.api.dependencies.run_ready import validate_run_ready as require_run_ready
 from backend.app.services.ai_snapshot_service import generate_manager_review, generate_individual_feedback
 from backend.app.services.ai_department_service import generate_department_brief
+from backend.app.services.ai_cache_service import ai_cache_stats
+from backend.app.services.ai_pregeneration_service import (
+    enqueue_ai_pregeneration,
+    get_pregeneration_status,
+)
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
@@ -59,3 +64,19 @@ def get_dept_brief(
 ):
     brief = generate_department_brief(db, department, run_month)
     return {"department": department, "brief": brief}
+
+@router.get("/cache/stats")
+def get_ai_cache_stats(db: Session = Depends(get_db)):
+    return ai_cache_stats(db)
+
+@router.post("/pregenerate", status_code=202)
+def start_pregeneration(run_month: str = Depends(require_run_ready)):
+    enqueue_ai_pregeneration(run_month)
+    return get_pregeneration_status(run_month)
+
+@router.get("/pregenerate/status")
+def pregeneration_status(run_month: str = Query(..., pattern=r"^\d{4}-\d{2}$")):
+    status = get_pregeneration_status(run_month)
+    if not status:
+        raise HTTPException(status_code=404, detail="No pre-generation job for this run_month")
+    return status
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
+from pydantic import BaseModel
 
 from backend.app.db.session import get_db
 from backend.app.models.employee import Employee
@@ -14,15 +15,25 @@ from backend.app.services.analytics_service import (
 )
 from backend.app.services.cost_efficiency_service import get_cost_efficiency_scatter
 from backend.app.services.department_trend_service import get_department_trend
-from backend.app.services.insight_service import get_employee_insights
-from backend.app.services.department_insight_service import department_quadrant_summary, generate_department_insights, get_department_insights
+from backend.app.services.insight_service import get_employee_insights, get_employee_insights_batch
+from backend.app.services.department_insight_service import department_quadrant_summary, generate_department_insights, get_department_insights, get_all_department_insights
 from backend.app.services.quadrant_service import classify_employee_quadrants
+from backend.app.services.rollup_service import get_department_rollups
+from backend.app.services.analytics_cache import analytics_cache, cached_analytics
 from backend.app.api.dependencies.run_ready import validate_run_ready as require_run_ready
+from backend.app.api.streaming import ndjson_response
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
+class EmployeeInsightsBatchRequest(BaseModel):
+    employee_ids: Optional[List[int]] = None
+    department: Optional[str] = None
+    all: bool = False
+
+
 @router.get("/employee/{employee_id}")
+@cached_analytics("analytics.employee")
 def employee_analytics(
     employee_id: int,
     run_month: str = Depends(require_run_ready),
@@ -32,6 +43,7 @@ def employee_analytics(
 
 
 @router.get("/department")
+@cached_analytics("analytics.department")
 def department_analytics(
     run_month: str = Depends(require_run_ready),
     db: Session = Depends(get_db),
@@ -40,6 +52,7 @@ def department_analytics(
 
 
 @router.get("/leaderboard")
+@cached_analytics("analytics.leaderboard")
 def leaderboard(
     run_month: str = Depends(require_run_ready),
     limit: int = 10,
@@ -49,6 +62,7 @@ def leaderboard(
 
 
 @router.get("/insights/employee/{employee_id}")
+@cached_analytics("analytics.insights.employee")
 def employee_insights(
     employee_id: int,
     run_month: str = Depends(require_run_ready),
@@ -57,7 +71,39 @@ def employee_insights(
     return get_employee_insights(db, employee_id, run_month)
 
 
+@router.post("/insights/employees")
+def employee_insights_batch(
+    request: EmployeeInsightsBatchRequest,
+    run_month: str = Depends(require_run_ready),
+    db: Session = Depends(get_db)
+):
+    """
+    Streams insights (NDJSON, one employee per line) for a list of
+    employee ids, a department, or everyone when all=true.
+    """
+    selectors = sum([
+        request.employee_ids is not None,
+        request.department is not None,
+        request.all,
+    ])
+    if selectors != 1:
+        raise HTTPException(
+            status_code=422,
+            detail="Provide exactly one of employee_ids, department or all=true",
+        )
+
+    return ndjson_response(
+        get_employee_insights_batch(
+            db,
+            run_month,
+            employee_ids=request.employee_ids,
+            department=request.department,
+        )
+    )
+
+
 @router.get("/insights/department/{department}")
+@cached_analytics("analytics.insights.department")
 def department_insights(
     department: str,
     run_month: str = Depends(require_run_ready),
@@ -66,7 +112,17 @@ def department_insights(
     return get_department_insights(db, department, run_month)
 
 
+@router.get("/insights/departments")
+@cached_analytics("analytics.insights.departments")
+def all_department_insights(
+    run_month: str = Depends(require_run_ready),
+    db: Session = Depends(get_db)
+):
+    return get_all_department_insights(db, run_month)
+
+
 @router.get("/trends/department/{department}")
+@cached_analytics("analytics.trends.department")
 def department_trend(
     department: str,
     db: Session = Depends(get_db)
@@ -75,6 +131,7 @@ def department_trend(
 
 
 @router.get("/scatter/cost-efficiency")
+@cached_analytics("analytics.scatter.cost_efficiency")
 def cost_efficiency_scatter(
     run_month: str = Depends(require_run_ready),
     db: Session = Depends(get_db),
@@ -83,14 +140,17 @@ def cost_efficiency_scatter(
 
 
 @router.get("/quadrants")
+@cached_analytics("analytics.quadrants")
 def employee_quadrants(
     run_month: str = Depends(require_run_ready),
+    per_department: bool = False,
     db: Session = Depends(get_db),
 ):
-    return classify_employee_quadrants(db, run_month)   
+    return classify_employee_quadrants(db, run_month, per_department)
 
 
 @router.get("/departments/quadrants")
+@cached_analytics("analytics.departments.quadrants")
 def department_quadrants(
     run_month: str = Depends(require_run_ready),
     db: Session = Depends(get_db),
@@ -99,6 +159,7 @@ def department_quadrants(
 
 
 @router.get("/departments/insights")
+@cached_analytics("analytics.departments.insights")
 def department_ai_insights(
     run_month: str = Depends(require_run_ready),
     db: Session = Depends(get_db),
@@ -153,6 +214,7 @@ def get_yearly_insights(year: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/summary")
+@cached_analytics("analytics.summary")
 def get_dashboard_summary(
     run_month: str = Depends(require_run_ready),
     db: Session = Depends(get_db)
@@ -163,15 +225,20 @@ def get_dashboard_summary(
     - Total Payroll: Sum of base salaries.
     - Avg Performance: Average efficiency score for this run.
     """
-    employees = db.query(Employee).filter(Employee.run_month == run_month).all()
-    count = len(employees)
-    total_payroll = sum([e.base_salary for e in employees])
-    
+    # Every employee of the run counts, including departments with nobody rated
+    count, total_payroll = (
+        db.query(func.count(Employee.id), func.sum(Employee.base_salary))
+        .filter(Employee.run_month == run_month)
+        .one()
+    )
+    total_payroll = total_payroll or 0
+
+    rollups = get_department_rollups(db, run_month)
+    rated = sum(r.rated_count for r in rollups)
     avg_efficiency = (
-        db.query(func.avg(EmployeeMetric.efficiency_score))
-        .filter(EmployeeMetric.run_month == run_month)
-        .scalar()
-    ) or 0
+        sum(r.avg_efficiency * r.rated_count for r in rollups) / rated
+        if rated else 0
+    )
     
     return {
         "run_month": run_month,
@@ -185,4 +252,9 @@ def get_dashboard_summary(
 def get_all_runs(db: Session = Depends(get_db)):
     """Returns list of all available run_months."""
     runs = db.query(Employee.run_month).distinct().order_by(Employee.run_month.desc()).all()
-    return [r[0] for r in runs]
\ No newline at end of file
+    return [r[0] for r in runs]
+
+@router.get("/cache/stats")
+def analytics_cache_stats():
+    """Hit/miss counters and memory use of the analytics result cache."""
+    return analytics_cache.stats()
@@ -1,17 +1,23 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from backend.app.db.session import get_db
+from backend.app.services.analytics_cache import cached_analytics
 from backend.app.services.charts_service import (
     department_efficiency_chart,
+    parse_bucket_edges,
     peer_distribution_chart,
     salary_vs_efficiency_chart,
     employee_efficiency_trend,
 )
+from backend.app.services.person_service import department_metric_series, person_metric_series
 
 router = APIRouter(prefix="/analytics/charts", tags=["Analytics Charts"])
 
 @router.get("/department-efficiency")
+@cached_analytics("charts.department_efficiency")
 def department_efficiency(
     run_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
     db: Session = Depends(get_db),
@@ -22,16 +28,26 @@ def department_efficiency(
     }
 
 @router.get("/peer-distribution")
+@cached_analytics("charts.peer_distribution")
 def peer_distribution(
     run_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    bins: int = Query(5, ge=1, le=100),
+    edges: Optional[str] = Query(None, description="Comma-separated bucket edges; overrides bins"),
+    by_department: bool = False,
     db: Session = Depends(get_db),
 ):
+    try:
+        bucket_edges = parse_bucket_edges(edges) if edges else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
         "run_month": run_month,
-        "buckets": peer_distribution_chart(db, run_month),
+        **peer_distribution_chart(db, run_month, bins, bucket_edges, by_department),
     }
 
 @router.get("/salary-vs-efficiency")
+@cached_analytics("charts.salary_vs_efficiency")
 def salary_efficiency(
     run_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
     db: Session = Depends(get_db),
@@ -42,6 +58,7 @@ def salary_efficiency(
     }
 
 @router.get("/employee-trend/{employee_id}")
+@cached_analytics("charts.employee_trend")
 def employee_trend(
     employee_id: int,
     db: Session = Depends(get_db),
@@ -50,3 +67,30 @@ def employee_trend(
         "employee_id": employee_id,
         "trend": employee_efficiency_trend(db, employee_id),
     }
+
+@router.get("/person-trend/{person_key}")
+@cached_analytics("charts.person_trend")
+def person_trend(
+    person_key: str,
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    db: Session = Depends(get_db),
+):
+    """person_key is the opaque key from the employees listing, not an email."""
+    return {
+        "person_key": person_key,
+        "series": person_metric_series(db, person_key, start_month, end_month),
+    }
+
+@router.get("/department-trend/{department}")
+@cached_analytics("charts.department_trend")
+def department_series(
+    department: str,
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    db: Session = Depends(get_db),
+):
+    return {
+        "department": department,
+        "series": department_metric_series(db, department, start_month, end_month),
+    }
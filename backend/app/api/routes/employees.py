@@ -11,6 +11,7 @@ class EmployeeResponse(BaseModel):
     id: int
     name: str
     email: str
+    person_key: Optional[str]
     department: str
     job_title: Optional[str]
     manager_id: Optional[int]
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from backend.app.core.query_metrics import query_metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db")
+def db_metrics():
+    """Per-route SQL statement count and DB time histograms (this process only)."""
+    return {"routes": query_metrics.snapshot()}
+
+
+@router.post("/db/reset")
+def reset_db_metrics():
+    """Only registered when DB_METRICS_ENDPOINTS_ENABLED is set (no auth)."""
+    query_metrics.reset()
+    return {"status": "reset"}
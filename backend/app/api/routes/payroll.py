@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 import csv
 import io
@@ -8,10 +10,29 @@ from backend.app.services.metrics_service import generate_employee_metrics
 from backend.app.services.payroll_service import get_employee_payslip
 from backend.app.services.payroll_ai_service import explain_payroll_run
 from backend.app.db.session import get_db
+from backend.app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from backend.app.api.streaming import (
+    attachment_response,
+    csv_response,
+    json_array_response,
+    ndjson_response,
+)
+from backend.app.services.payslip_export_service import (
+    PAYSLIP_EXPORT_FIELDS,
+    PayslipExportError,
+    ensure_columnar_support,
+    has_payslips,
+    iter_columnar_export,
+    iter_payslip_rows,
+    iter_zip_export,
+)
 from backend.app.services.payroll_service import (
+    ENTRY_FIELDS,
     PayrollExecutionError,
     get_payroll_run_summary,
-    get_payroll_run_entries,
+    get_payroll_run_entries_page,
+    has_payroll_entries,
+    iter_payroll_run_entries,
     run_payroll,
     get_consolidated_payroll,
 )
@@ -22,10 +43,11 @@ router = APIRouter(prefix="/payroll", tags=["Payroll"])
 def execute_payroll(
     run_month: str,
     executed_by: str,
+    adjustment: bool = False,
     db: Session = Depends(get_db),
 ):
     try:
-        run_id = run_payroll(db, run_month, executed_by)
+        run_id = run_payroll(db, run_month, executed_by, adjustment=adjustment)
         return {
             "status": "success",
             "payroll_run_id": run_id,
@@ -54,13 +76,47 @@ def payroll_run_summary(
 @router.get("/run/{run_id}/entries")
 def payroll_run_entries(
     run_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
     db: Session = Depends(get_db),
 ):
-    results = get_payroll_run_entries(db=db, run_id=run_id)
-
-    if not results:
+    """
+    Entries ordered by employee name. Without cursor or limit, JSON is
+    the whole run as one array, as before paging existed (streamed, not
+    buffered). With either, JSON returns one keyset page of limit rows
+    (default 1000; next page cursor in the X-Next-Cursor header).
+    ndjson and csv always stream the whole run through a server-side
+    cursor.
+    """
+    paged = format == "json" and (cursor is not None or limit is not None)
+
+    if not paged:
+        if not has_payroll_entries(db, run_id):
+            raise HTTPException(status_code=404, detail="No payroll entries found")
+
+        rows = iter_payroll_run_entries(db, run_id)
+        if format == "csv":
+            return csv_response(rows, ENTRY_FIELDS, f"payroll_run_{run_id}_entries.csv")
+        if format == "ndjson":
+            return ndjson_response(rows)
+        return json_array_response(rows)
+
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 2:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    results, next_after = get_payroll_run_entries_page(db, run_id, after, limit or 1000)
+
+    if not results and after is None:
         raise HTTPException(status_code=404, detail="No payroll entries found")
 
+    if next_after is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(list(next_after))
+
     return results
 
 
@@ -112,10 +168,48 @@ def employee_payslip(
         **data,
     }
 
+EXPORT_MEDIA_TYPES = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "zip": ("application/zip", "zip"),
+}
+
+
+@router.get("/run/{run_id}/payslips/export")
+def export_payslips(
+    run_id: int,
+    format: str = Query("csv", pattern="^(csv|parquet|arrow|zip)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Every payslip of the run in one streamed download: csv, parquet,
+    arrow (IPC stream) or zip (one text document per payslip).
+    """
+    if format in ("parquet", "arrow"):
+        try:
+            ensure_columnar_support()
+        except PayslipExportError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+
+    if not has_payslips(db, run_id):
+        raise HTTPException(status_code=404, detail="No payslips found")
+
+    rows = iter_payslip_rows(db, run_id)
+    filename = f"payslips_run_{run_id}"
+
+    if format == "csv":
+        return csv_response(rows, PAYSLIP_EXPORT_FIELDS, f"{filename}.csv")
+
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+    chunks = iter_zip_export(rows) if format == "zip" else iter_columnar_export(rows, format)
+    return attachment_response(chunks, media_type, f"{filename}.{extension}")
+
+
 @router.post("/run")
 def run_payroll_api(
     run_month: str,
     executed_by: str,
+    adjustment: bool = False,
     db: Session = Depends(get_db),
 ):
     try:
@@ -123,6 +217,7 @@ def run_payroll_api(
             db=db,
             run_month=run_month,
             executed_by=executed_by,
+            adjustment=adjustment,
         )
         return {
             "status": "success",
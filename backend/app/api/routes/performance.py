@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from backend.app.db.session import get_db
 from backend.app.models.performance import PerformanceReview
-from backend.app.models.employee import Employee
+from backend.app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from backend.app.api.streaming import ndjson_response
+from backend.app.services.performance_service import (
+    get_performance_snapshot_page,
+    iter_performance_snapshots,
+)
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -42,22 +47,42 @@ def get_manager_reviews(manager_id: int, db: Session = Depends(get_db)):
     return db.query(PerformanceReview).filter(PerformanceReview.manager_id == manager_id).all()
 
 @router.get("/snapshots/{quarter}/{year}")
-def get_performance_snapshots(quarter: int, year: int, db: Session = Depends(get_db)):
-    # Logic to get all employees and their performance for a quarter
-    employees = db.query(Employee).all()
-    results = []
-    for emp in employees:
-        review = db.query(PerformanceReview).filter(
-            PerformanceReview.employee_id == emp.id,
-            PerformanceReview.quarter == quarter,
-            PerformanceReview.year == year
-        ).first()
-        results.append({
-            "employee_id": emp.id,
-            "name": emp.name,
-            "department": emp.department,
-            "job_title": emp.job_title,
-            "rating": review.rating if review else None,
-            "status": "Completed" if review else "Pending"
-        })
+def get_performance_snapshots(
+    quarter: int,
+    year: int,
+    response: Response,
+    run_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    person_key: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Review status per employee for a quarter, scoped to a run_month or a
+    person_key. JSON returns one keyset page (next page cursor in the
+    X-Next-Cursor header); ndjson streams every row.
+    """
+    if not run_month and not person_key:
+        raise HTTPException(status_code=422, detail="run_month or person_key is required")
+
+    if format == "ndjson":
+        return ndjson_response(
+            iter_performance_snapshots(db, quarter, year, run_month, person_key)
+        )
+
+    after_employee_id = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 1 or type(after[0]) is not int:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after_employee_id = after[0]
+
+    results, next_after = get_performance_snapshot_page(
+        db, quarter, year, run_month, person_key, after_employee_id, limit
+    )
+
+    if next_after is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([next_after])
+
     return results
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import get_db
+from backend.app.services.pipeline_service import (
+    PipelineJobError,
+    get_pipeline_job_status,
+    list_pipeline_jobs,
+    retry_pipeline_job,
+)
+
+router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
+
+
+@router.get("/jobs")
+def pipeline_jobs(
+    run_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    db: Session = Depends(get_db),
+):
+    return list_pipeline_jobs(db, run_month)
+
+
+@router.get("/jobs/{job_id}")
+def pipeline_job_status(
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    status = get_pipeline_job_status(db, job_id)
+
+    if not status:
+        raise HTTPException(status_code=404, detail="Pipeline job not found")
+
+    return status
+
+
+@router.post("/jobs/{job_id}/retry")
+def retry_pipeline(
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    try:
+        retry_pipeline_job(db, job_id)
+    except PipelineJobError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return get_pipeline_job_status(db, job_id)
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def ndjson_response(rows: Iterable[dict], headers: dict | None = None) -> StreamingResponse:
+    """
+    Streams rows as newline-delimited JSON, one object per line, so the
+    client can start consuming before the last row is produced.
+    """
+    return StreamingResponse(
+        iter_ndjson(rows),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+def iter_json_array(rows: Iterable[dict]) -> Iterator[str]:
+    yield "["
+    for i, row in enumerate(rows):
+        yield ("," if i else "") + json.dumps(row, default=str)
+    yield "]"
+
+
+def json_array_response(rows: Iterable[dict], headers: dict | None = None) -> StreamingResponse:
+    """
+    Streams rows as a single JSON array: the same body as returning the
+    list, without holding every row in memory.
+    """
+    return StreamingResponse(
+        iter_json_array(rows),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def iter_csv(rows: Iterable[dict], fieldnames: list) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        # Hand over what was written and reuse the buffer
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+def attachment_response(
+    chunks: Iterable,
+    media_type: str,
+    filename: str,
+    headers: dict | None = None,
+) -> StreamingResponse:
+    """Streams chunks (str or bytes) as a file download."""
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **(headers or {}),
+        },
+    )
+
+
+def csv_response(
+    rows: Iterable[dict],
+    fieldnames: list,
+    filename: str,
+    headers: dict | None = None,
+) -> StreamingResponse:
+    """Streams rows as CSV (header line first) as a file download."""
+    return attachment_response(iter_csv(rows, fieldnames), "text/csv", filename, headers)
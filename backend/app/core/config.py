@@ -1,19 +1,78 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Workforce AI Platform"
 
-    MYSQL_USER: str
-    MYSQL_PASSWORD: str
-    MYSQL_HOST: str
+    # Database backend: "mysql" (default) or "sqlite".
+    # DATABASE_URL, when set, overrides both.
+    DATABASE_BACKEND: str = "mysql"
+    DATABASE_URL: Optional[str] = None
+
+    MYSQL_USER: Optional[str] = None
+    MYSQL_PASSWORD: Optional[str] = None
+    MYSQL_HOST: Optional[str] = None
     MYSQL_PORT: int = 3307
-    MYSQL_DB: str
+    MYSQL_DB: Optional[str] = None
+
+    # File path for the sqlite backend; unset means in-memory
+    SQLITE_PATH: Optional[str] = None
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
 
-    MONGO_URI: str
+    MONGO_URI: Optional[str] = None
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
 
+    # Background processing
+    BACKGROUND_WORKERS: int = 2
+    UPLOAD_SPOOL_DIR: Optional[str] = None  # defaults to the system temp dir
+    # A QUEUED/RUNNING pipeline job with no progress for this long is taken
+    # to be orphaned by a dead process and failed at startup. Must exceed
+    # the longest stage and queue wait.
+    PIPELINE_STALE_AFTER_SECONDS: int = 3600
+
+    # Analytics result cache (per process)
+    ANALYTICS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 4096
+
+    # AI generation ("openai" or "stub" for offline/load testing)
+    AI_BACKEND: str = "openai"
+    AI_MODEL: str = "gpt-4o-mini"
+    OPENAI_API_KEY: Optional[str] = None  # falls back to the environment
+    AI_TIMEOUT_SECONDS: float = 30.0
+    AI_MAX_RETRIES: int = 2
+    AI_MAX_CONCURRENCY: int = 4
+    AI_QUEUE_TIMEOUT_SECONDS: float = 60.0
+    AI_STUB_LATENCY_MS: int = 0
+
+    # Persistent LLM response cache (ai_response_cache table). Size it to
+    # hold a month of pre-generated content: about two 2-3 KB responses per
+    # employee, plus one brief per department.
+    AI_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    AI_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Pre-generate reviews/feedback/briefs once a month's metrics are done
+    AI_PREGENERATE_ON_METRICS: bool = True
+    AI_PREGENERATE_PARALLELISM: int = 4
+
+    # Deduction table used by payroll runs (see tax_engine.TAX_TABLES)
+    PAYROLL_TAX_TABLE: str = "default"
+
+    # Worker processes rendering payslip documents for ZIP exports (0/1 = inline).
+    # The text template is cheaper to render than to hand to a process, so
+    # the default is inline; worth enabling only for costlier renderers.
+    # Even then the first PAYSLIP_RENDER_INLINE_ROWS payslips of an export
+    # are rendered inline.
+    PAYSLIP_RENDER_WORKERS: int = 0
+    PAYSLIP_RENDER_INLINE_ROWS: int = 50000
+
+    # Per-request SQL instrumentation (X-DB-* headers)
+    DB_METRICS_ENABLED: bool = True
+    # /metrics/db and /metrics/db/reset; unauthenticated, so debug only
+    DB_METRICS_ENDPOINTS_ENABLED: bool = False
+
     class Config:
         env_file = ".env"
         extra = "allow"
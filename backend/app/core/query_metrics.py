@@ -0,0 +1,212 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Histogram bucket upper bounds; the last bucket is open-ended
+DB_TIME_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+QUERY_COUNT_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 1000]
+
+SLOW_STATEMENT_PREVIEW = 300
+
+
+class RequestQueryStats:
+    """SQL cost accumulated by one request."""
+
+    __slots__ = ("queries", "db_time_ms", "rows", "slowest_ms", "slowest_statement")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time_ms = 0.0
+        self.rows = 0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.queries += 1
+        self.db_time_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def headers(self):
+        return {
+            "X-DB-Queries": str(self.queries),
+            "X-DB-Time-Ms": f"{self.db_time_ms:.2f}",
+            "X-DB-Rows": str(self.rows),
+            "X-DB-Slowest-Ms": f"{self.slowest_ms:.2f}",
+        }
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def start_request() -> tuple[RequestQueryStats, object]:
+    stats = RequestQueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token) -> None:
+    _current_stats.reset(token)
+
+
+class _RowCountingCursor:
+    """
+    Wraps a DBAPI cursor and adds the rows fetched through it to a
+    request's stats. cursor.rowcount cannot be used: it is -1 for SELECTs
+    on sqlite and counts affected rather than fetched rows elsewhere.
+    """
+
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats: RequestQueryStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+# =========================
+# ENGINE HOOKS
+# =========================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats.record(statement, elapsed_ms)
+
+    # Statements that return rows are read through context.cursor, which
+    # also covers streamed (yield_per) results
+    if context is not None and cursor.description is not None:
+        context.cursor = _RowCountingCursor(cursor, stats)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for failed statements
+    starts = exception_context.connection.info.get("query_start_time") \
+        if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# =========================
+# PER-ROUTE HISTOGRAMS
+# =========================
+
+class _Histogram:
+    def __init__(self, bounds: list):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self):
+        labels = [f"le_{b}" for b in self.bounds] + ["inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "sum": round(self.total, 2),
+            "max": round(self.max, 2),
+        }
+
+
+class _RouteMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.rows = 0
+        self.db_time_ms = _Histogram(DB_TIME_BUCKETS_MS)
+        self.queries = _Histogram(QUERY_COUNT_BUCKETS)
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+
+
+class QueryMetricsRegistry:
+    """In-process, per-route aggregation of RequestQueryStats."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, stats: RequestQueryStats):
+        with self._lock:
+            m = self._routes.get(route)
+            if m is None:
+                m = self._routes[route] = _RouteMetrics()
+
+            m.requests += 1
+            m.rows += stats.rows
+            m.db_time_ms.observe(stats.db_time_ms)
+            m.queries.observe(stats.queries)
+            if stats.slowest_ms > m.slowest_ms:
+                m.slowest_ms = stats.slowest_ms
+                m.slowest_statement = stats.slowest_statement
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {
+                    "requests": m.requests,
+                    "avg_queries": round(m.queries.total / m.requests, 2),
+                    "avg_db_time_ms": round(m.db_time_ms.total / m.requests, 2),
+                    "rows": m.rows,
+                    "queries": m.queries.snapshot(),
+                    "db_time_ms": m.db_time_ms.snapshot(),
+                    "slowest_ms": round(m.slowest_ms, 2),
+                    "slowest_statement": (
+                        m.slowest_statement[:SLOW_STATEMENT_PREVIEW]
+                        if m.slowest_statement else None
+                    ),
+                }
+                for route, m in sorted(self._routes.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+query_metrics = QueryMetricsRegistry()
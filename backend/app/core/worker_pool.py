@@ -0,0 +1,43 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from backend.app.core.config import settings
+
+_executor: ThreadPoolExecutor | None = None
+_ai_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Process-local pool for background work (pipeline stages, batch jobs).
+    Created on first use so importing this module has no side effects.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix="workforce-worker",
+        )
+    return _executor
+
+
+def get_ai_executor() -> ThreadPoolExecutor:
+    """
+    Single thread for AI pre-generation jobs, so a long LLM batch never
+    holds a BACKGROUND_WORKERS slot that upload pipelines need. Jobs for
+    several months run one after another.
+    """
+    global _ai_executor
+    if _ai_executor is None:
+        _ai_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="workforce-ai-job",
+        )
+    return _ai_executor
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    return get_executor().submit(fn, *args, **kwargs)
+
+
+def submit_ai(fn, *args, **kwargs) -> Future:
+    return get_ai_executor().submit(fn, *args, **kwargs)
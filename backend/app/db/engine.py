@@ -1,17 +1,85 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
 from backend.app.core.config import settings
+from backend.app.core.query_metrics import install_query_hooks
+
+
+def build_database_url() -> str:
+    if settings.DATABASE_URL:
+        return settings.DATABASE_URL
+
+    if settings.DATABASE_BACKEND == "sqlite":
+        if settings.SQLITE_PATH:
+            return f"sqlite:///{settings.SQLITE_PATH}"
+        return "sqlite://"
+
+    if settings.DATABASE_BACKEND != "mysql":
+        raise RuntimeError(f"Unsupported DATABASE_BACKEND: {settings.DATABASE_BACKEND}")
+
+    missing = [
+        name for name in ("MYSQL_USER", "MYSQL_PASSWORD", "MYSQL_HOST", "MYSQL_DB")
+        if getattr(settings, name) is None
+    ]
+    if missing:
+        raise RuntimeError(f"MySQL backend requires {', '.join(missing)}")
+
+    return (
+        f"mysql+pymysql://{settings.MYSQL_USER}:"
+        f"{settings.MYSQL_PASSWORD}@"
+        f"{settings.MYSQL_HOST}:"
+        f"{settings.MYSQL_PORT}/"
+        f"{settings.MYSQL_DB}"
+    )
+
+
+def _sqlite_pragmas(in_memory: bool):
+    def on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        # WAL lets readers run alongside the single writer (file databases only)
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+    return on_connect
+
+
+def create_app_engine(url: str):
+    """
+    Engine for any supported backend. SQLite gets WAL and tuned pragmas;
+    in-memory SQLite shares one connection so every session sees the
+    same database.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        database = make_url(url).database
+        in_memory = not database or database == ":memory:"
+
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            **({"poolclass": StaticPool} if in_memory else {}),
+        )
+        event.listen(engine, "connect", _sqlite_pragmas(in_memory))
+    else:
+        engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+        )
+
+    # Per-request statement count / DB time (see core.query_metrics)
+    if settings.DB_METRICS_ENABLED:
+        install_query_hooks(engine)
+
+    return engine
+
+
+DATABASE_URL = build_database_url()
 
-DATABASE_URL = (
-    f"mysql+pymysql://{settings.MYSQL_USER}:"
-    f"{settings.MYSQL_PASSWORD}@"
-    f"{settings.MYSQL_HOST}:"
-    f"{settings.MYSQL_PORT}/"
-    f"{settings.MYSQL_DB}"
-)
-
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+engine = create_app_engine(DATABASE_URL)
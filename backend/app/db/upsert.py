@@ -0,0 +1,82 @@
+from sqlalchemy import Table, bindparam, select, tuple_, update
+from sqlalchemy.orm import Session
+
+
+def _native_upsert(dialect_name: str, table: Table, index_elements, update_columns):
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(
+            {c: stmt.inserted[c] for c in update_columns}
+        )
+
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={c: stmt.excluded[c] for c in update_columns},
+        )
+
+    return None
+
+
+def _lookup_upsert(db: Session, table: Table, rows, index_elements, update_columns):
+    # Portable path: one lookup on the unique key, then bulk insert + bulk update
+    key_cols = [table.c[c] for c in index_elements]
+    keys = [tuple(r[c] for c in index_elements) for r in rows]
+
+    existing = {
+        tuple(row[:-1]): row[-1]
+        for row in db.execute(
+            select(*key_cols, table.c.id).where(tuple_(*key_cols).in_(keys))
+        )
+    }
+
+    to_insert, to_update = [], []
+    for key, row in zip(keys, rows):
+        pk = existing.get(key)
+        if pk is None:
+            to_insert.append(row)
+        else:
+            to_update.append({"_pk": pk, **{c: row[c] for c in update_columns}})
+
+    if to_insert:
+        db.execute(table.insert(), to_insert)
+    if to_update:
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("_pk"))
+            .values({c: bindparam(c) for c in update_columns}),
+            to_update,
+        )
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    rows: list[dict],
+    index_elements: list[str],
+    update_columns: list[str],
+):
+    """
+    INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE for a batch of rows.
+
+    index_elements must match a unique constraint on `table`; columns in
+    update_columns are overwritten on conflict, everything else keeps the
+    stored value. Runs as a single executemany on MySQL, SQLite and
+    PostgreSQL; other dialects fall back to lookup + insert/update.
+    """
+    if not rows:
+        return
+
+    stmt = _native_upsert(db.get_bind().dialect.name, table, index_elements, update_columns)
+    if stmt is None:
+        _lookup_upsert(db, table, rows, index_elements, update_columns)
+    else:
+        db.execute(stmt, rows)
@@ -1,14 +1,45 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.app.api.pagination import NEXT_CURSOR_HEADER
+from backend.app.core.config import settings
+from backend.app.core.query_metrics import end_request, query_metrics, start_request
+from backend.app.db.session import SessionLocal
+from backend.app.services.payslip_export_service import shutdown_render_pool
+from backend.app.services.pipeline_service import fail_interrupted_pipeline_jobs
 
 from backend.app.api.routes import payroll, ai, payroll_upload
 from backend.app.api.routes import analytics
 from backend.app.api.routes import analytics_charts
 from backend.app.api.routes import run_state
+from backend.app.api.routes import pipeline
+from backend.app.api.routes import metrics
+
+logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background jobs orphaned by a dead process cannot resume; free them for retry
+    db = SessionLocal()
+    try:
+        failed = fail_interrupted_pipeline_jobs(db)
+        if failed:
+            logger.warning("Marked %d orphaned pipeline jobs FAILED", failed)
+    except SQLAlchemyError:
+        # A database that is not reachable / migrated yet must not stop startup
+        logger.warning("Could not recover interrupted pipeline jobs", exc_info=True)
+    finally:
+        db.close()
+    yield
+    shutdown_render_pool()
 
-app = FastAPI(title="Workforce AI Platform")
+
+app = FastAPI(title="Workforce AI Platform", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,9 +47,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER,
+        "X-DB-Queries", "X-DB-Time-Ms", "X-DB-Rows", "X-DB-Slowest-Ms",
+    ],
 )
+
+
+@app.middleware("http")
+async def db_query_metrics(request: Request, call_next):
+    """
+    Counts the SQL issued while handling the request (engine hooks in
+    core.query_metrics) and reports it as X-DB-* headers. Streamed bodies
+    are still being produced when headers go out, so for those the
+    numbers cover only the work done before the first chunk.
+    """
+    if not settings.DB_METRICS_ENABLED:
+        return await call_next(request)
+
+    stats, token = start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+
+    route = request.scope.get("route")
+    route_key = f"{request.method} {route.path}" if route else "unmatched"
+    query_metrics.observe(route_key, stats)
+
+    response.headers.update(stats.headers())
+    return response
+
+
 app.include_router(run_state.router)
 app.include_router(payroll_upload.router)
+app.include_router(pipeline.router)
+if settings.DB_METRICS_ENDPOINTS_ENABLED:
+    app.include_router(metrics.router)
 app.include_router(payroll.router)
 app.include_router(analytics.router)
 app.include_router(analytics_charts.router)
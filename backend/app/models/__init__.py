@@ -5,4 +5,9 @@ from backend.app.models.audit_log import AuditLog
 from backend.app.models.employee_metric import EmployeeMetric
 from backend.app.models.performance import PerformanceReview
 from backend.app.models.user import User
-from backend.app.models.run_state import RunState
\ No newline at end of file
+from backend.app.models.run_state import RunState
+from backend.app.models.pipeline_job import PipelineJob, PipelineStage
+from backend.app.models.department_metric_rollup import DepartmentMetricRollup
+from backend.app.models.ai_response_cache import AIResponseCache
+from backend.app.models.quadrant_cutoff import QuadrantCutoff
+from backend.app.models.consolidated_payroll import ConsolidatedPayroll
\ No newline at end of file
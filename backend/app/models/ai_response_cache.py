@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Index, UniqueConstraint
+
+from backend.app.db.base import Base
+
+
+class AIResponseCache(Base):
+    """
+    Content-addressed LLM responses. cache_key is the sha256 of the
+    prompt (which embeds every input), model and temperature.
+    """
+    __tablename__ = "ai_response_cache"
+
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), nullable=False)
+    kind = Column(String(50), nullable=False)         # manager_review, department_brief, ...
+    run_month = Column(String(7), nullable=True)
+    model = Column(String(100), nullable=False)
+    temperature = Column(Float, nullable=False)
+
+    response = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("cache_key", name="uq_ai_response_cache_key"),
+        # Size-based eviction drops least recently used entries first
+        Index("ix_ai_response_cache_last_hit", "last_hit_at"),
+        Index("ix_ai_response_cache_expires", "expires_at"),
+    )
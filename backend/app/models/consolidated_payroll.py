@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey, UniqueConstraint
+
+from backend.app.db.base import Base
+
+
+class ConsolidatedPayroll(Base):
+    """
+    Per-employee totals of a base payroll run plus all of its adjustment
+    runs. Maintained by payroll execution, so consolidated reads do not
+    re-aggregate payroll_entries.
+    """
+    __tablename__ = "consolidated_payroll"
+
+    id = Column(Integer, primary_key=True)
+    base_run_id = Column(Integer, ForeignKey("payroll_runs.id"), nullable=False)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+
+    total_gross = Column(Float, nullable=False, default=0.0)
+    total_net = Column(Float, nullable=False, default=0.0)
+
+    adjustment_count = Column(Integer, nullable=False, default=0)
+    last_run_id = Column(Integer, ForeignKey("payroll_runs.id"), nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("base_run_id", "employee_id", name="uq_consolidated_run_employee"),
+    )
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+
+from backend.app.db.base import Base
+
+
+class DepartmentMetricRollup(Base):
+    """
+    Per-department aggregates for one run_month, written by the metrics
+    stage so department views are single-row lookups.
+    """
+    __tablename__ = "department_metric_rollups"
+
+    id = Column(Integer, primary_key=True)
+    run_month = Column(String(7), nullable=False)
+    department = Column(String(100), nullable=False)
+
+    headcount = Column(Integer, nullable=False)
+    # Employees with an hourly rate; the efficiency, hourly and quadrant
+    # columns cover only these
+    rated_count = Column(Integer, nullable=False, default=0)
+
+    avg_efficiency = Column(Float, nullable=False)
+    median_efficiency = Column(Float, nullable=False)
+    p10_efficiency = Column(Float, nullable=False)
+    p90_efficiency = Column(Float, nullable=False)
+    avg_hourly_rate = Column(Float, nullable=False)
+
+    total_base_salary = Column(Float, nullable=False, default=0.0)
+    total_gross_pay = Column(Float, nullable=False, default=0.0)
+    total_net_pay = Column(Float, nullable=False, default=0.0)
+
+    high_value_count = Column(Integer, nullable=False, default=0)
+    star_count = Column(Integer, nullable=False, default=0)
+    overpaid_count = Column(Integer, nullable=False, default=0)
+    underutilized_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("run_month", "department", name="uq_rollup_run_department"),
+        Index("ix_rollup_department_month", "department", "run_month"),
+    )
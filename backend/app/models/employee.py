@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, UniqueConstraint, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +11,8 @@ class Employee(Base):
     run_month = Column(String(7), nullable=False, index=True)   # YYYY-MM
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False, index=True)
+    # Stable identity across monthly snapshots (normalized email)
+    person_key = Column(String(255), nullable=True, index=True)
     department = Column(String(100), nullable=False)
     job_title = Column(String(100), nullable=True)
     base_salary = Column(Float, nullable=False)
@@ -31,4 +33,8 @@ class Employee(Base):
      
     __table_args__ = (
         UniqueConstraint("run_month", "email", name="uq_employee_run_month_email"),
+        # Department views group a month's snapshot by department
+        Index("ix_employees_month_department", "run_month", "department"),
+        # Payroll entry listings page through a month in name order
+        Index("ix_employees_month_name", "run_month", "name"),
     )   
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 
 from backend.app.db.base import Base
@@ -11,15 +11,30 @@ class EmployeeMetric(Base):
 
     employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     run_month = Column(String(7), nullable=False)
+    person_key = Column(String(255), nullable=True)  # copied from Employee
 
-    hourly_rate = Column(Float, nullable=False)
-    dept_avg_hourly = Column(Float, nullable=False)
+    # NULL when the employee's salary or working hours are unusable;
+    # such rows are left out of month-wide analytics
+    hourly_rate = Column(Float, nullable=True)
+    dept_avg_hourly = Column(Float, nullable=True)
 
-    peer_percentile = Column(Float, nullable=False)
-    efficiency_score = Column(Float, nullable=False)
+    peer_percentile = Column(Float, nullable=True)
+    efficiency_score = Column(Float, nullable=True)
+
+    # HIGH_VALUE / STAR / OVERPAID / UNDERUTILIZED against the month's
+    # QuadrantCutoff; set by the metrics stage
+    quadrant = Column(String(20), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
         UniqueConstraint("employee_id", "run_month", name="uq_employee_run"),
+        # Cross-month time series for one person is a single range scan
+        Index("ix_employee_metrics_person_month", "person_key", "run_month"),
+        # Per-month analytics: filter on run_month, join on employee_id and
+        # read the two scores straight from the index
+        Index(
+            "ix_employee_metrics_month_employee",
+            "run_month", "employee_id", "efficiency_score", "hourly_rate",
+        ),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, func
 from datetime import datetime
 from backend.app.db.base import Base
 from sqlalchemy.orm import relationship  # <-- Add this line
@@ -34,3 +34,11 @@ class PayrollEntry(Base):
     net_pay = Column(Float, nullable=False)
     risk_score = Column(Float)
 
+    __table_args__ = (
+        # Run reads filter by run and join on employee; gross/net ride
+        # along so pay totals come from the index
+        Index(
+            "ix_payroll_entries_run_employee",
+            "payroll_run_id", "employee_id", "gross_pay", "net_pay",
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from backend.app.db.base import Base
@@ -23,3 +23,8 @@ class Payslip(Base):
     status = Column(String(20), default="ISSUED", nullable=False)
 
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Run exports read a run's payslips in id order
+        Index("ix_payslips_run", "payroll_run_id", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -22,3 +22,8 @@ class PerformanceReview(Base):
     # Relationships
     employee = relationship("Employee", foreign_keys=[employee_id], back_populates="performance_reviews")
     manager_reviewer = relationship("Employee", foreign_keys=[manager_id], back_populates="authored_reviews")
+
+    __table_args__ = (
+        # Snapshot joins look up one employee's review for a (year, quarter)
+        Index("ix_performance_reviews_employee_period", "employee_id", "year", "quarter"),
+    )
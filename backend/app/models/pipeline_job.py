@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from backend.app.db.base import Base
+
+
+class PipelineJob(Base):
+    """
+    One upload -> payroll -> metrics run for a run_month.
+    Stage completion flags still live on RunState; this tracks progress.
+    """
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(Integer, primary_key=True)
+    run_month = Column(String(7), nullable=False, index=True)  # YYYY-MM
+    executed_by = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="QUEUED")
+    source_path = Column(String(500), nullable=True)  # spooled CSV, removed after ingest
+    error = Column(Text, nullable=True)
+    # Base payroll run written by this job's PAYROLL stage
+    payroll_run_id = Column(Integer, ForeignKey("payroll_runs.id"), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    # Touched whenever the job is queued or its worker makes progress
+    heartbeat_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    stages = relationship(
+        "PipelineStage",
+        back_populates="job",
+        order_by="PipelineStage.position",
+        cascade="all, delete-orphan",
+    )
+
+
+class PipelineStage(Base):
+    __tablename__ = "pipeline_stages"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("pipeline_jobs.id", ondelete="CASCADE"), nullable=False)
+    stage = Column(String(20), nullable=False)   # INGEST, PAYROLL, METRICS
+    position = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0)
+    detail = Column(Text, nullable=True)
+
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+
+    job = relationship("PipelineJob", back_populates="stages")
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "stage", name="uq_pipeline_job_stage"),
+    )
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+
+from backend.app.db.base import Base
+
+
+class QuadrantCutoff(Base):
+    """
+    Median cutoffs used to place a run_month's employees into quadrants.
+    Written by the metrics stage alongside EmployeeMetric.quadrant.
+    """
+    __tablename__ = "quadrant_cutoffs"
+
+    id = Column(Integer, primary_key=True)
+    run_month = Column(String(7), nullable=False)
+
+    cost_median = Column(Float, nullable=False)
+    efficiency_median = Column(Float, nullable=False)
+
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("run_month", name="uq_quadrant_cutoff_run_month"),
+    )
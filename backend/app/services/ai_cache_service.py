@@ -0,0 +1,208 @@
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.db.upsert import bulk_upsert
+from backend.app.models.ai_response_cache import AIResponseCache
+from backend.app.services.ai_engine import complete
+
+
+# Eviction trims to this share of AI_CACHE_MAX_BYTES so it does not run on every write
+EVICT_TARGET_RATIO = 0.9
+
+# run_months being pre-generated (this process only); eviction skips their entries
+_protected_months = set()
+_protected_lock = threading.Lock()
+
+
+@contextmanager
+def protect_run_month(run_month: str):
+    """Exempts run_month's entries from eviction while the block runs."""
+    with _protected_lock:
+        _protected_months.add(run_month)
+    try:
+        yield
+    finally:
+        with _protected_lock:
+            _protected_months.discard(run_month)
+
+
+def ai_cache_key(prompt: str, model: str, temperature: float) -> str:
+    """
+    Prompts embed every input (metrics, quadrant, department stats), so
+    hashing the prompt with model and temperature addresses the content.
+    """
+    payload = json.dumps(
+        {"prompt": prompt, "model": model, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_cached_response(db: Session, cache_key: str) -> Optional[str]:
+    now = datetime.utcnow()
+    row = (
+        db.query(AIResponseCache.id, AIResponseCache.response)
+        .filter(
+            AIResponseCache.cache_key == cache_key,
+            AIResponseCache.expires_at > now,
+        )
+        .first()
+    )
+    if row is None:
+        return None
+
+    db.execute(
+        update(AIResponseCache)
+        .where(AIResponseCache.id == row.id)
+        .values(hits=AIResponseCache.hits + 1, last_hit_at=now)
+    )
+    db.commit()
+    return row.response
+
+
+def cached_keys(db: Session, cache_keys: list[str]) -> set[str]:
+    """The subset of cache_keys that already has a live entry."""
+    now = datetime.utcnow()
+    found = set()
+    for start in range(0, len(cache_keys), 1000):
+        found.update(
+            k for (k,) in db.query(AIResponseCache.cache_key).filter(
+                AIResponseCache.cache_key.in_(cache_keys[start:start + 1000]),
+                AIResponseCache.expires_at > now,
+            )
+        )
+    return found
+
+
+def store_response(
+    db: Session,
+    cache_key: str,
+    kind: str,
+    model: str,
+    temperature: float,
+    response: str,
+    run_month: Optional[str] = None,
+    evict: bool = True,
+):
+    """
+    Upserts one response. Eviction scans the whole table, so bulk writers
+    pass evict=False and call evict_ai_cache once when they are done.
+    """
+    now = datetime.utcnow()
+    bulk_upsert(
+        db,
+        AIResponseCache.__table__,
+        [{
+            "cache_key": cache_key,
+            "kind": kind,
+            "run_month": run_month,
+            "model": model,
+            "temperature": temperature,
+            "response": response,
+            "size_bytes": len(response.encode()),
+            "hits": 0,
+            "created_at": now,
+            "last_hit_at": now,
+            "expires_at": now + timedelta(seconds=settings.AI_CACHE_TTL_SECONDS),
+        }],
+        index_elements=["cache_key"],
+        update_columns=["response", "size_bytes", "created_at", "last_hit_at", "expires_at"],
+    )
+    if evict:
+        evict_ai_cache(db)
+    db.commit()
+
+
+def evict_ai_cache(db: Session):
+    """
+    Drops expired entries, then least recently used ones above the size
+    cap. Entries of protected run_months are never evicted for size.
+    """
+    db.query(AIResponseCache).filter(
+        AIResponseCache.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+
+    total = db.query(func.coalesce(func.sum(AIResponseCache.size_bytes), 0)).scalar()
+    if total <= settings.AI_CACHE_MAX_BYTES:
+        return
+
+    with _protected_lock:
+        protected = list(_protected_months)
+
+    candidates = db.query(AIResponseCache.id, AIResponseCache.size_bytes)
+    if protected:
+        candidates = candidates.filter(or_(
+            AIResponseCache.run_month.is_(None),
+            AIResponseCache.run_month.notin_(protected),
+        ))
+
+    target = settings.AI_CACHE_MAX_BYTES * EVICT_TARGET_RATIO
+    doomed = []
+    for entry_id, size in (
+        candidates
+        .order_by(AIResponseCache.last_hit_at)
+        .yield_per(1000)
+    ):
+        if total <= target:
+            break
+        doomed.append(entry_id)
+        total -= size
+
+    if doomed:
+        db.query(AIResponseCache).filter(
+            AIResponseCache.id.in_(doomed)
+        ).delete(synchronize_session=False)
+
+
+def cached_completion(
+    db: Session,
+    kind: str,
+    prompt: str,
+    temperature: float,
+    run_month: Optional[str] = None,
+    model: Optional[str] = None,
+) -> str:
+    """
+    ai_engine.complete() behind the persistent cache. Only successful
+    completions are stored; errors propagate so callers' fallbacks are
+    never cached.
+    """
+    model = model or settings.AI_MODEL
+    cache_key = ai_cache_key(prompt, model, temperature)
+
+    cached = get_cached_response(db, cache_key)
+    if cached is not None:
+        return cached
+
+    response = complete(prompt, temperature=temperature, model=model)
+    store_response(db, cache_key, kind, model, temperature, response, run_month)
+    return response
+
+
+def ai_cache_stats(db: Session):
+    rows = (
+        db.query(
+            AIResponseCache.kind,
+            func.count(AIResponseCache.id),
+            func.coalesce(func.sum(AIResponseCache.size_bytes), 0),
+            func.coalesce(func.sum(AIResponseCache.hits), 0),
+        )
+        .group_by(AIResponseCache.kind)
+        .all()
+    )
+    return {
+        "max_bytes": settings.AI_CACHE_MAX_BYTES,
+        "ttl_seconds": settings.AI_CACHE_TTL_SECONDS,
+        "kinds": {
+            kind: {"entries": entries, "bytes": int(size), "hits": int(hits)}
+            for kind, entries, size, hits in rows
+        },
+    }
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from backend.app.core.config import settings
+
+
+class AIEngineError(Exception):
+    pass
+
+
+# =========================
+# BACKENDS
+# =========================
+
+class OpenAIBackend:
+    """
+    One sync and one async OpenAI client per process, created on first
+    use so importing a service never needs an API key or opens a pool.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    def _client_kwargs(self):
+        return {
+            "api_key": settings.OPENAI_API_KEY,
+            "timeout": settings.AI_TIMEOUT_SECONDS,
+            "max_retries": settings.AI_MAX_RETRIES,
+        }
+
+    def _sync(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(**self._client_kwargs())
+        return self._client
+
+    def _async(self):
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    from openai import AsyncOpenAI
+                    self._async_client = AsyncOpenAI(**self._client_kwargs())
+        return self._async_client
+
+    def complete(self, prompt: str, model: str, temperature: float) -> str:
+        response = self._sync().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+        )
+        return response.choices[0].message.content
+
+    async def acomplete(self, prompt: str, model: str, temperature: float) -> str:
+        response = await self._async().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+        )
+        return response.choices[0].message.content
+
+
+class StubBackend:
+    """
+    Offline backend: deterministic text derived from the prompt after an
+    optional fixed delay (AI_STUB_LATENCY_MS), for load tests and local runs.
+    """
+
+    def __init__(self, latency_ms: int = 0):
+        self.latency_ms = latency_ms
+
+    def _text(self, prompt: str, model: str, temperature: float) -> str:
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return (
+            f"[stub:{model} t={temperature}] Generated summary {digest}.\n\n"
+            "Performance is in line with the provided metrics. "
+            "Recommendation: review again next cycle."
+        )
+
+    def complete(self, prompt: str, model: str, temperature: float) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._text(prompt, model, temperature)
+
+    async def acomplete(self, prompt: str, model: str, temperature: float) -> str:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._text(prompt, model, temperature)
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "stub": lambda: StubBackend(settings.AI_STUB_LATENCY_MS),
+}
+
+
+# =========================
+# SHARED PROVIDER
+# =========================
+
+_backend = None
+_backend_lock = threading.Lock()
+
+# Caps in-flight LLM calls per process (sync callers and the event loop
+# are limited separately)
+_sync_slots = threading.BoundedSemaphore(settings.AI_MAX_CONCURRENCY)
+_async_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_ai_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                factory = BACKENDS.get(settings.AI_BACKEND)
+                if factory is None:
+                    raise AIEngineError(f"Unknown AI_BACKEND: {settings.AI_BACKEND}")
+                _backend = factory()
+    return _backend
+
+
+def set_ai_backend(backend) -> None:
+    """Swap the process-wide backend (e.g. StubBackend for load tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def complete(prompt: str, temperature: float, model: Optional[str] = None) -> str:
+    """
+    Single-prompt chat completion through the shared backend. Waits up to
+    AI_QUEUE_TIMEOUT_SECONDS for a free concurrency slot.
+    """
+    if not _sync_slots.acquire(timeout=settings.AI_QUEUE_TIMEOUT_SECONDS):
+        raise AIEngineError("AI backend is saturated; try again shortly")
+    try:
+        return get_ai_backend().complete(prompt, model or settings.AI_MODEL, temperature)
+    finally:
+        _sync_slots.release()
+
+
+async def acomplete(prompt: str, temperature: float, model: Optional[str] = None) -> str:
+    global _async_slots
+    if _async_slots is None:
+        _async_slots = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+
+    try:
+        await asyncio.wait_for(_async_slots.acquire(), settings.AI_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise AIEngineError("AI backend is saturated; try again shortly")
+    try:
+        return await get_ai_backend().acomplete(prompt, model or settings.AI_MODEL, temperature)
+    finally:
+        _async_slots.release()
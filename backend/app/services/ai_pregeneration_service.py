@@ -0,0 +1,161 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from backend.app.core import worker_pool
+from backend.app.core.config import settings
+from backend.app.db.session import SessionLocal
+from backend.app.models.employee import Employee
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.ai_cache_service import (
+    ai_cache_key,
+    cached_keys,
+    evict_ai_cache,
+    protect_run_month,
+    store_response,
+)
+from backend.app.services.ai_department_service import (
+    DEPARTMENT_BRIEF_TEMPERATURE,
+    build_department_brief_prompt,
+)
+from backend.app.services.ai_engine import complete
+from backend.app.services.ai_snapshot_service import (
+    INDIVIDUAL_FEEDBACK_TEMPERATURE,
+    MANAGER_REVIEW_TEMPERATURE,
+    build_individual_feedback_prompt,
+    build_manager_review_prompt,
+)
+from backend.app.services.quadrant_service import ensure_month_quadrants
+from backend.app.services.rollup_service import get_department_rollups
+
+
+# run_month -> progress of the latest pre-generation job (this process only)
+_status = {}
+_status_lock = threading.Lock()
+
+
+def _collect_prompts(db: Session, run_month: str):
+    """
+    Every (kind, prompt, temperature) the AI endpoints would send for
+    run_month, built with the same prompt builders so the cache keys match.
+    Employees and metrics (with stored quadrants) are loaded in one query.
+    """
+    ensure_month_quadrants(db, run_month)
+
+    rows = (
+        db.query(Employee.name, Employee.job_title, Employee.department, EmployeeMetric)
+        .join(EmployeeMetric, EmployeeMetric.employee_id == Employee.id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            # Unrated employees get no snapshot from the live endpoints either
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .all()
+    )
+
+    prompts = []
+    for name, role, department, metrics in rows:
+        data = {
+            "name": name,
+            "role": role,
+            "department": department,
+            "metrics": metrics,
+            "quadrant": metrics.quadrant or "UNKNOWN",
+        }
+        prompts.append(("manager_review", build_manager_review_prompt(data), MANAGER_REVIEW_TEMPERATURE))
+        prompts.append(("individual_feedback", build_individual_feedback_prompt(data), INDIVIDUAL_FEEDBACK_TEMPERATURE))
+
+    for rollup in get_department_rollups(db, run_month):
+        if rollup.headcount:
+            prompts.append((
+                "department_brief",
+                build_department_brief_prompt(rollup.department, run_month, rollup),
+                DEPARTMENT_BRIEF_TEMPERATURE,
+            ))
+
+    return prompts
+
+
+def _set_status(run_month: str, **values):
+    with _status_lock:
+        _status.setdefault(run_month, {}).update(values)
+
+
+def pregenerate_ai_content(run_month: str):
+    """
+    Worker entry point. Fills the AI response cache for run_month so the
+    snapshot and brief endpoints become cache reads. LLM calls run with
+    AI_PREGENERATE_PARALLELISM workers (ai_engine still caps in-flight
+    calls); results are written from this thread as they complete.
+    The month's entries are exempt from eviction until the job ends, so
+    a month larger than AI_CACHE_MAX_BYTES does not evict its own output.
+    """
+    model = settings.AI_MODEL
+    db = SessionLocal()
+    try:
+        prompts = _collect_prompts(db, run_month)
+        keyed = [(ai_cache_key(p, model, t), kind, p, t) for kind, p, t in prompts]
+        done = cached_keys(db, [k for k, *_ in keyed])
+        pending = [item for item in keyed if item[0] not in done]
+
+        _set_status(
+            run_month,
+            total=len(keyed),
+            already_cached=len(done),
+            generated=0,
+            failed=0,
+        )
+
+        # Protected until the batch's eviction pass has run
+        with protect_run_month(run_month):
+            with ThreadPoolExecutor(
+                max_workers=settings.AI_PREGENERATE_PARALLELISM,
+                thread_name_prefix="ai-pregenerate",
+            ) as pool:
+                futures = {
+                    pool.submit(complete, prompt, temperature, model): (key, kind, temperature)
+                    for key, kind, prompt, temperature in pending
+                }
+                for future in as_completed(futures):
+                    key, kind, temperature = futures[future]
+                    try:
+                        response = future.result()
+                    except Exception:
+                        # Failures are left uncached; the endpoint retries live
+                        _set_status(run_month, failed=_status[run_month]["failed"] + 1)
+                        continue
+
+                    store_response(db, key, kind, model, temperature, response, run_month, evict=False)
+                    _set_status(run_month, generated=_status[run_month]["generated"] + 1)
+
+            # One eviction pass for the whole batch instead of one per write
+            evict_ai_cache(db)
+            db.commit()
+
+        _set_status(run_month, state="COMPLETED", finished_at=datetime.utcnow())
+    except Exception as e:
+        db.rollback()
+        _set_status(run_month, state="FAILED", error=str(e), finished_at=datetime.utcnow())
+    finally:
+        db.close()
+
+
+def enqueue_ai_pregeneration(run_month: str):
+    with _status_lock:
+        if _status.get(run_month, {}).get("state") in ("QUEUED", "RUNNING"):
+            return None
+        _status[run_month] = {"state": "QUEUED", "queued_at": datetime.utcnow()}
+
+    def run():
+        _set_status(run_month, state="RUNNING", started_at=datetime.utcnow())
+        pregenerate_ai_content(run_month)
+
+    return worker_pool.submit_ai(run)
+
+
+def get_pregeneration_status(run_month: str):
+    with _status_lock:
+        status = _status.get(run_month)
+        return {"run_month": run_month, **status} if status else None
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
-from openai import OpenAI
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
-from backend.app.services.quadrant_service import classify_employee_quadrants
+from backend.app.services.quadrant_service import ensure_month_quadrants
+from backend.app.services.ai_cache_service import cached_completion
+
+MANAGER_REVIEW_TEMPERATURE = 0.4
+INDIVIDUAL_FEEDBACK_TEMPERATURE = 0.5
 
-client = OpenAI()
 
 def get_employee_data(db: Session, employee_id: int, run_month: str):
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
@@ -13,31 +15,29 @@ def get_employee_data(db: Session, employee_id: int, run_month: str):
         EmployeeMetric.run_month == run_month
     ).first()
 
-    if not employee or not metrics:
+    if not employee or not metrics or metrics.hourly_rate is None:
         return None
 
-    # Get quadrant context
-    quadrant_data = classify_employee_quadrants(db, run_month)
-    emp_quadrant = next(
-        (e for e in quadrant_data["employees"] if e["employee_id"] == employee_id),
-        None
-    )
+    # Quadrant is stored on the metric row by the metrics stage
+    if metrics.quadrant is None:
+        ensure_month_quadrants(db, run_month)
+        db.refresh(metrics)
 
     return {
         "name": employee.name,
         "role": employee.job_title,
         "department": employee.department,
         "metrics": metrics,
-        "quadrant": emp_quadrant["quadrant"] if emp_quadrant else "UNKNOWN"
+        "quadrant": metrics.quadrant or "UNKNOWN"
     }
 
-def generate_manager_review(db: Session, employee_id: int, run_month: str) -> str:
-    data = get_employee_data(db, employee_id, run_month)
-    if not data:
-        return "Employee data not found."
-
+def build_manager_review_prompt(data: dict) -> str:
     metrics = data["metrics"]
-    
+    # employee_metrics carries no risk score yet
+    risk_score = getattr(metrics, "risk_score", None)
+    if risk_score is None:
+        risk_score = "N/A"
+
     prompt = f"""
     You are an expert HR and workforce analyst. Write a confidential review for a manager regarding their direct report.
 
@@ -47,7 +47,7 @@ def generate_manager_review(db: Session, employee_id: int, run_month: str) -> st
     Key Metrics:
     - Efficiency Score: {metrics.efficiency_score} (Peer Percentile: {metrics.peer_percentile}%)
     - Hourly Cost: ${metrics.hourly_rate}
-    - Risk Score: {metrics.risk_score}/100
+    - Risk Score: {risk_score}/100
 
     Task:
     Provide a concise strategic review (3-4 paragraphs) covering:
@@ -57,22 +57,12 @@ def generate_manager_review(db: Session, employee_id: int, run_month: str) -> st
 
     Tone: Professional, objective, and action-oriented.
     """
+    return prompt
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.4,
-    )
-
-    return response.choices[0].message.content
-
-def generate_individual_feedback(db: Session, employee_id: int, run_month: str) -> str:
-    data = get_employee_data(db, employee_id, run_month)
-    if not data:
-        return "Employee data not found."
 
+def build_individual_feedback_prompt(data: dict) -> str:
     metrics = data["metrics"]
-    
+
     prompt = f"""
     You are a supportive performance coach. Write a constructive feedback summary for the employee to read.
 
@@ -90,11 +80,25 @@ def generate_individual_feedback(db: Session, employee_id: int, run_month: str)
 
     Tone: Encouraging, constructive, and forward-looking. Avoid using internal jargon like "Quadrant" or "Risk Score" directly.
     """
+    return prompt
+
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.5,
+def generate_manager_review(db: Session, employee_id: int, run_month: str) -> str:
+    data = get_employee_data(db, employee_id, run_month)
+    if not data:
+        return "Employee data not found."
+
+    prompt = build_manager_review_prompt(data)
+    return cached_completion(
+        db, "manager_review", prompt, temperature=MANAGER_REVIEW_TEMPERATURE, run_month=run_month
     )
 
-    return response.choices[0].message.content
+def generate_individual_feedback(db: Session, employee_id: int, run_month: str) -> str:
+    data = get_employee_data(db, employee_id, run_month)
+    if not data:
+        return "Employee data not found."
+
+    prompt = build_individual_feedback_prompt(data)
+    return cached_completion(
+        db, "individual_feedback", prompt, temperature=INDIVIDUAL_FEEDBACK_TEMPERATURE, run_month=run_month
+    )
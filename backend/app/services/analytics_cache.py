@@ -0,0 +1,145 @@
+import functools
+import json
+import threading
+from collections import OrderedDict
+
+from backend.app.core.config import settings
+
+
+class AnalyticsCache:
+    """
+    In-process LRU cache for analytics read endpoints.
+
+    Entries are keyed by (endpoint, parameters, data version). Each
+    run_month has its own version; writers bump it through
+    invalidate_run_month, which makes older entries unreachable and drops
+    them. Cross-month endpoints (trends) are keyed on a global generation
+    that every invalidation bumps.
+
+    The cache is per process: with several uvicorn workers each keeps its
+    own copy and only sees invalidations issued in that process.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()   # key -> (value, size, run_month)
+        self._versions = {}             # run_month -> int
+        self._generation = 0
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key(self, endpoint: str, run_month, params: dict):
+        version = (
+            self._versions.get(run_month, 0)
+            if run_month is not None
+            else self._generation
+        )
+        return (endpoint, run_month, version, tuple(sorted(params.items())))
+
+    def get_or_compute(self, endpoint: str, run_month, params: dict, compute):
+        with self._lock:
+            key = self._key(endpoint, run_month, params)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        size = len(json.dumps(value, default=str))
+
+        with self._lock:
+            # A writer may have invalidated the month while we computed
+            if self._key(endpoint, run_month, params) != key:
+                return value
+            if size > self.max_bytes:
+                return value
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (value, size, run_month)
+            self._bytes += size
+
+            while self._entries and (
+                self._bytes > self.max_bytes
+                or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+        return value
+
+    def invalidate_run_month(self, run_month: str):
+        with self._lock:
+            self._versions[run_month] = self._versions.get(run_month, 0) + 1
+            self._generation += 1
+            self.invalidations += 1
+
+            stale = [
+                key for key, (_, _, rm) in self._entries.items()
+                if rm is None or rm == run_month
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+analytics_cache = AnalyticsCache(
+    max_bytes=settings.ANALYTICS_CACHE_MAX_BYTES,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_run_month(run_month: str):
+    analytics_cache.invalidate_run_month(run_month)
+
+
+def cached_analytics(endpoint: str):
+    """
+    Route decorator: caches the response keyed by endpoint, the route's
+    arguments (except the db session) and the run_month data version.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(**kwargs):
+            params = {k: v for k, v in kwargs.items() if k != "db"}
+            run_month = params.get("run_month")
+            return analytics_cache.get_or_compute(
+                endpoint,
+                run_month,
+                params,
+                lambda: fn(**kwargs),
+            )
+        return wrapper
+    return decorator
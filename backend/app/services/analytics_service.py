@@ -3,6 +3,7 @@ from sqlalchemy import func, desc
 
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.rollup_service import get_department_rollups
 
 
 def get_employee_comparison(
@@ -55,27 +56,16 @@ def get_employee_comparison(
 
 
 def get_department_performance(db: Session, run_month: str):
-    rows = (
-        db.query(
-            Employee.department,
-            func.avg(EmployeeMetric.efficiency_score).label("avg_efficiency"),
-            func.avg(EmployeeMetric.hourly_rate).label("avg_hourly"),
-            func.count(EmployeeMetric.id).label("employee_count"),
-        )
-        .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(EmployeeMetric.run_month == run_month)
-        .group_by(Employee.department)
-        .all()
-    )
+    rollups = get_department_rollups(db, run_month)
 
     return [
         {
             "department": r.department,
             "avg_efficiency": round(r.avg_efficiency, 2),
-            "avg_hourly_rate": round(r.avg_hourly, 2),
-            "employee_count": r.employee_count,
+            "avg_hourly_rate": round(r.avg_hourly_rate, 2),
+            "employee_count": r.headcount,
         }
-        for r in rows
+        for r in rollups
     ]
 
 
@@ -88,7 +78,10 @@ def get_leaderboard(db: Session, run_month: str, limit: int):
             EmployeeMetric.peer_percentile,
         )
         .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(EmployeeMetric.run_month == run_month)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.peer_percentile.isnot(None),
+        )
         .order_by(desc(EmployeeMetric.peer_percentile))
         .limit(limit)
         .all()
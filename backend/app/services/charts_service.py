@@ -1,57 +1,134 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import func, case, literal
 
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.rollup_service import get_department_rollups
+from backend.app.services.person_service import get_person_key, person_metric_series
 
 def department_efficiency_chart(db: Session, run_month: str):
-    rows = (
-        db.query(
-            Employee.department,
-            func.avg(EmployeeMetric.efficiency_score).label("avg_efficiency")
-        )
-        .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(EmployeeMetric.run_month == run_month)
-        .group_by(Employee.department)
-        .all()
-    )
-
     return [
         {
-            "department": dept,
-            "avg_efficiency": round(avg_eff, 2)
+            "department": r.department,
+            "avg_efficiency": round(r.avg_efficiency, 2)
         }
-        for dept, avg_eff in rows
+        for r in get_department_rollups(db, run_month)
     ]
 
-def peer_distribution_chart(db: Session, run_month: str):
-    buckets = [
-        (0, 20),
-        (21, 40),
-        (41, 60),
-        (61, 80),
-        (81, 100),
-    ]
+def histogram_edges(lower: float, upper: float, bins: int) -> list:
+    """bins equal-width bucket edges spanning [lower, upper]."""
+    if bins < 1:
+        raise ValueError("bins must be at least 1")
+    width = (upper - lower) / bins
+    return [round(lower + i * width, 6) for i in range(bins)] + [float(upper)]
+
+
+def parse_bucket_edges(edges: str) -> list:
+    """Comma-separated, strictly increasing edges, e.g. "0,50,75,90,100"."""
+    try:
+        values = [float(v) for v in edges.split(",")]
+    except ValueError:
+        raise ValueError("edges must be comma-separated numbers")
+    if len(values) < 2 or any(b <= a for a, b in zip(values, values[1:])):
+        raise ValueError("edges need at least two strictly increasing values")
+    return values
+
 
-    result = []
+def _bucket_label(low: float, high: float) -> str:
+    return f"{low:g}-{high:g}"
 
-    for low, high in buckets:
-        count = (
-            db.query(func.count(EmployeeMetric.id))
-            .filter(
-                EmployeeMetric.run_month == run_month,
-                EmployeeMetric.peer_percentile.between(low, high)
-            )
-            .scalar()
+
+def metric_histogram(
+    db: Session,
+    run_month: str,
+    column,
+    edges: list,
+    by_department: bool = False,
+):
+    """
+    Histogram of an employee_metrics column for run_month in one grouped
+    query, whatever the number of buckets.
+
+    Buckets are half-open [edges[i], edges[i+1]); the last one also takes
+    edges[-1], so every value inside the range lands in exactly one bucket.
+    With by_department the same query groups by department as well and
+    the per-department buckets are returned alongside the totals.
+    """
+    # 1. Bucket index in SQL: first upper edge the value sits below
+    inner_edges = edges[1:-1]
+    bucket = (
+        case(*[(column < high, i) for i, high in enumerate(inner_edges)], else_=len(inner_edges))
+        if inner_edges
+        else literal(0)
+    ).label("bucket")
+
+    group_by = [bucket]
+    query = db.query(bucket, func.count(EmployeeMetric.id))
+    if by_department:
+        query = (
+            db.query(Employee.department, bucket, func.count(EmployeeMetric.id))
+            .join(Employee, Employee.id == EmployeeMetric.employee_id)
         )
+        group_by = [Employee.department, bucket]
 
-        result.append({
-            "range": f"{low}-{high}",
-            "count": count
-        })
+    rows = (
+        query
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            column.between(edges[0], edges[-1]),
+        )
+        .group_by(*group_by)
+        .all()
+    )
 
+    # 2. Scatter the grouped counts into dense bucket lists
+    n_buckets = len(edges) - 1
+    totals = [0] * n_buckets
+    departments = {}
+    for row in rows:
+        if by_department:
+            department, idx, count = row
+            departments.setdefault(department, [0] * n_buckets)[idx] += count
+        else:
+            idx, count = row
+        totals[idx] += count
+
+    def as_buckets(counts):
+        return [
+            {
+                "range": _bucket_label(low, high),
+                "low": low,
+                "high": high,
+                "count": count,
+            }
+            for low, high, count in zip(edges, edges[1:], counts)
+        ]
+
+    result = {"buckets": as_buckets(totals)}
+    if by_department:
+        result["departments"] = [
+            {"department": department, "buckets": as_buckets(counts)}
+            for department, counts in sorted(departments.items())
+        ]
     return result
 
+
+def peer_distribution_chart(
+    db: Session,
+    run_month: str,
+    bins: int = 5,
+    edges: list = None,
+    by_department: bool = False,
+):
+    """Peer percentile distribution; explicit edges override bins."""
+    return metric_histogram(
+        db,
+        run_month,
+        EmployeeMetric.peer_percentile,
+        edges or histogram_edges(0, 100, bins),
+        by_department=by_department,
+    )
+
 def salary_vs_efficiency_chart(db: Session, run_month: str):
     rows = (
         db.query(
@@ -76,6 +153,20 @@ def salary_vs_efficiency_chart(db: Session, run_month: str):
     ]
 
 def employee_efficiency_trend(db: Session, employee_id: int):
+    """
+    Efficiency history of the person behind this monthly employee_id,
+    across every run_month snapshot.
+    """
+    person_key = get_person_key(db, employee_id)
+    if person_key:
+        return [
+            {
+                "run_month": point["run_month"],
+                "efficiency": point["efficiency"]
+            }
+            for point in person_metric_series(db, person_key)
+        ]
+
     rows = (
         db.query(
             EmployeeMetric.run_month,
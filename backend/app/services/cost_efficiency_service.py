@@ -17,7 +17,10 @@ def get_cost_efficiency_scatter(
             EmployeeMetric.efficiency_score,
         )
         .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(EmployeeMetric.run_month == run_month)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
         .all()
     )
 
@@ -1,58 +1,41 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from collections import defaultdict
+import numpy as np
 
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
-from backend.app.services.quadrant_service import classify_employee_quadrants
+from backend.app.services.rollup_service import (
+    QUADRANT_COLUMNS,
+    get_department_rollups,
+    quadrant_percentages,
+)
 
-def get_department_insights(
-    db: Session,
+def _department_insight_payload(
     department: str,
-    run_month: str
+    run_month: str,
+    values: np.ndarray,
 ):
-    # 1. Base query
-    base_q = (
-        db.query(EmployeeMetric)
-        .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(
-            Employee.department == department,
-            EmployeeMetric.run_month == run_month
-        )
-    )
+    """
+    Builds the insight payload from one department's metric rows.
+    values columns: peer_percentile, efficiency_score, hourly_rate.
+    """
+    peer_percentile = values[:, 0]
+    efficiency = values[:, 1]
+    hourly = values[:, 2]
 
-    total_employees = base_q.count()
-    if total_employees == 0:
-        raise ValueError("No employees found for department")
+    total_employees = int(values.shape[0])
 
-    # 2. Aggregates
-    aggregates = (
-        db.query(
-            func.avg(EmployeeMetric.efficiency_score).label("avg_eff"),
-            func.avg(EmployeeMetric.hourly_rate).label("avg_hourly")
-        )
-        .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(
-            Employee.department == department,
-            EmployeeMetric.run_month == run_month
-        )
-        .first()
-    )
+    # 1. Aggregates
+    avg_eff = round(float(efficiency.mean()), 2)
+    avg_hourly = round(float(hourly.mean()), 2)
 
-    avg_eff = round(aggregates.avg_eff, 2)
-    avg_hourly = round(aggregates.avg_hourly, 2)
+    # 2. Distribution buckets
+    top = int(np.count_nonzero(peer_percentile >= 75))
+    mid = int(np.count_nonzero((peer_percentile >= 40) & (peer_percentile <= 74)))
+    bottom = int(np.count_nonzero(peer_percentile < 40))
 
-    # 3. Distribution buckets
-    top = base_q.filter(EmployeeMetric.peer_percentile >= 75).count()
-    mid = base_q.filter(
-        EmployeeMetric.peer_percentile.between(40, 74)
-    ).count()
-    bottom = base_q.filter(EmployeeMetric.peer_percentile < 40).count()
-
-    # 4. Risk detection
-    low_eff_count = base_q.filter(
-        EmployeeMetric.efficiency_score < avg_eff * 0.85
-    ).count()
+    # 3. Risk detection
+    low_eff_count = int(np.count_nonzero(efficiency < avg_eff * 0.85))
 
     risk_level = (
         "HIGH" if low_eff_count / total_employees > 0.3
@@ -60,7 +43,7 @@ def get_department_insights(
         else "LOW"
     )
 
-    # 5. Recommendations
+    # 4. Recommendations
     recommendations = []
 
     if risk_level == "HIGH":
@@ -77,7 +60,7 @@ def get_department_insights(
     if avg_hourly > avg_eff * 1.2:
         recommendations.append("Cost-efficiency review suggested")
 
-    # 6. Final payload
+    # 5. Final payload
     return {
         "department": department,
         "run_month": run_month,
@@ -95,50 +78,104 @@ def get_department_insights(
         "recommendations": recommendations
     }
 
-def department_quadrant_summary(db: Session, run_month: str):
-    try:
-        data = classify_employee_quadrants(db, run_month)
-    except ValueError:
+
+def get_department_insights(
+    db: Session,
+    department: str,
+    run_month: str
+):
+    # One fetch; every statistic is derived in memory from these rows
+    rows = (
+        db.query(
+            EmployeeMetric.peer_percentile,
+            EmployeeMetric.efficiency_score,
+            EmployeeMetric.hourly_rate,
+        )
+        .join(Employee, Employee.id == EmployeeMetric.employee_id)
+        .filter(
+            Employee.department == department,
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .all()
+    )
+
+    if not rows:
+        raise ValueError("No employees found for department")
+
+    return _department_insight_payload(
+        department,
+        run_month,
+        np.array(rows, dtype=np.float64),
+    )
+
+
+def get_all_department_insights(db: Session, run_month: str):
+    """
+    Insight payload for every department of run_month from a single
+    fetch, for the department overview screen.
+    """
+    rows = (
+        db.query(
+            Employee.department,
+            EmployeeMetric.peer_percentile,
+            EmployeeMetric.efficiency_score,
+            EmployeeMetric.hourly_rate,
+        )
+        .join(Employee, Employee.id == EmployeeMetric.employee_id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .order_by(Employee.department)
+        .all()
+    )
+
+    if not rows:
         return {
             "run_month": run_month,
             "departments": []
         }
 
-    dept_map = defaultdict(lambda: {
-        "total": 0,
-        "HIGH_VALUE": 0,
-        "STAR": 0,
-        "OVERPAID": 0,
-        "UNDERUTILIZED": 0,
-    })
+    departments = [r[0] for r in rows]
+    values = np.array([r[1:] for r in rows], dtype=np.float64)
 
-    for emp in data["employees"]:
-        dept = emp["department"]
-        quadrant = emp["quadrant"]
+    # Rows are sorted by department, so each group is a contiguous slice
+    boundaries = [0] + [
+        i for i in range(1, len(departments))
+        if departments[i] != departments[i - 1]
+    ] + [len(departments)]
 
-        dept_map[dept]["total"] += 1
-        dept_map[dept][quadrant] += 1
+    return {
+        "run_month": run_month,
+        "departments": [
+            _department_insight_payload(
+                departments[start],
+                run_month,
+                values[start:stop],
+            )
+            for start, stop in zip(boundaries, boundaries[1:])
+        ]
+    }
 
+def department_quadrant_summary(db: Session, run_month: str):
+    """
+    Per-department quadrant counts, read from the precomputed rollups
+    (which count the quadrants stored on each metric row).
+    """
     summary = []
 
-    for dept, counts in dept_map.items():
-        total = counts["total"]
+    for rollup in get_department_rollups(db, run_month):
+        counts = {
+            quadrant: getattr(rollup, column)
+            for quadrant, column in QUADRANT_COLUMNS.items()
+        }
 
         summary.append({
-            "department": dept,
-            "total_employees": total,
-            "quadrants": {
-                "HIGH_VALUE": counts["HIGH_VALUE"],
-                "STAR": counts["STAR"],
-                "OVERPAID": counts["OVERPAID"],
-                "UNDERUTILIZED": counts["UNDERUTILIZED"],
-            },
-            "percentages": {
-                "HIGH_VALUE": round(counts["HIGH_VALUE"] / total * 100, 1),
-                "STAR": round(counts["STAR"] / total * 100, 1),
-                "OVERPAID": round(counts["OVERPAID"] / total * 100, 1),
-                "UNDERUTILIZED": round(counts["UNDERUTILIZED"] / total * 100, 1),
-            }
+            "department": rollup.department,
+            "total_employees": rollup.headcount,
+            "quadrants": counts,
+            "percentages": quadrant_percentages(rollup),
         })
 
     return {
@@ -1,25 +1,22 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from backend.app.models.employee import Employee
-from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.models.department_metric_rollup import DepartmentMetricRollup
 
 
 def get_department_trend(
     db: Session,
     department: str
 ):
+    # One row per month from the precomputed rollups
     rows = (
         db.query(
-            EmployeeMetric.run_month.label("run_month"),
-            func.count(EmployeeMetric.employee_id).label("headcount"),
-            func.avg(EmployeeMetric.efficiency_score).label("avg_efficiency"),
-            func.avg(EmployeeMetric.hourly_rate).label("avg_hourly_rate"),
+            DepartmentMetricRollup.run_month,
+            DepartmentMetricRollup.headcount,
+            DepartmentMetricRollup.avg_efficiency,
+            DepartmentMetricRollup.avg_hourly_rate,
         )
-        .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(Employee.department == department)
-        .group_by(EmployeeMetric.run_month)
-        .order_by(EmployeeMetric.run_month)
+        .filter(DepartmentMetricRollup.department == department)
+        .order_by(DepartmentMetricRollup.run_month)
         .all()
     )
 
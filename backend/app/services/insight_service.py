@@ -1,5 +1,8 @@
+from typing import Iterator, Optional
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+import numpy as np
 
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
@@ -23,6 +26,9 @@ def get_employee_insights(
     if not metric:
         raise ValueError("Metrics not found for employee")
 
+    if metric.hourly_rate is None:
+        raise ValueError("Metrics not available: salary or working hours missing")
+
     # 2. Fetch employee snapshot
     employee = (
         db.query(Employee)
@@ -67,14 +73,151 @@ def get_employee_insights(
     )
 
     # 5. Risk classification
-    if efficiency_gap_pct < -20:
-        risk = "HIGH"
-    elif efficiency_gap_pct < -10:
-        risk = "MEDIUM"
-    else:
-        risk = "LOW"
+    risk = _classify_risk(efficiency_gap_pct)
 
     # 6. Recommendations (rule-based)
+    recommendations = _build_recommendations(risk, salary_efficiency_mismatch)
+
+    # 7. Final insight payload
+    return _insight_payload(
+        employee_id=employee.id,
+        name=employee.name,
+        role=employee.job_title,
+        department=employee.department,
+        run_month=run_month,
+        efficiency_score=metric.efficiency_score,
+        dept_eff_avg=dept_eff_avg,
+        efficiency_gap_pct=efficiency_gap_pct,
+        peer_percentile=metric.peer_percentile,
+        hourly_rate=metric.hourly_rate,
+        dept_hourly_avg=dept_hourly_avg,
+        risk=risk,
+        recommendations=recommendations,
+    )
+
+
+def get_employee_insights_batch(
+    db: Session,
+    run_month: str,
+    employee_ids: Optional[list[int]] = None,
+    department: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Insights for many employees at once: a list of ids, one department,
+    or everyone in run_month when neither is given.
+
+    One query loads every metric row of the departments involved; the
+    department aggregates, gap, risk and mismatch signals are then
+    evaluated as arrays. Returns a generator of per-employee payloads.
+    """
+    q = (
+        db.query(
+            Employee.id,
+            Employee.name,
+            Employee.job_title,
+            Employee.department,
+            EmployeeMetric.efficiency_score,
+            EmployeeMetric.peer_percentile,
+            EmployeeMetric.hourly_rate,
+        )
+        .join(Employee, Employee.id == EmployeeMetric.employee_id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+            Employee.run_month == run_month,
+        )
+    )
+
+    if department is not None:
+        q = q.filter(Employee.department == department)
+    elif employee_ids is not None:
+        # Department averages need every peer of the requested employees
+        requested_departments = (
+            select(Employee.department)
+            .where(
+                Employee.id.in_(employee_ids),
+                Employee.run_month == run_month,
+            )
+            .distinct()
+        )
+        q = q.filter(Employee.department.in_(requested_departments))
+
+    rows = q.order_by(Employee.department, Employee.name).all()
+    if not rows:
+        return iter(())
+
+    # 1. Arrays + department codes
+    codes = {}
+    dept_idx = np.array(
+        [codes.setdefault(r.department, len(codes)) for r in rows],
+        dtype=np.int64,
+    )
+    efficiency = np.array([r.efficiency_score for r in rows], dtype=np.float64)
+    hourly = np.array([r.hourly_rate for r in rows], dtype=np.float64)
+
+    # 2. Department aggregates, once per department
+    dept_count = np.bincount(dept_idx)
+    dept_eff_avg = (np.bincount(dept_idx, weights=efficiency) / dept_count)[dept_idx]
+    dept_hourly_avg = (np.bincount(dept_idx, weights=hourly) / dept_count)[dept_idx]
+
+    # 3. Deterministic signals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency_gap_pct = np.where(
+            dept_eff_avg > 0,
+            np.round((efficiency - dept_eff_avg) / dept_eff_avg * 100, 2),
+            0.0,
+        )
+
+    salary_efficiency_mismatch = (hourly > dept_hourly_avg) & (efficiency < dept_eff_avg)
+
+    # 4. Risk classification
+    risk = np.select(
+        [efficiency_gap_pct < -20, efficiency_gap_pct < -10],
+        ["HIGH", "MEDIUM"],
+        default="LOW",
+    )
+
+    if employee_ids is not None and department is None:
+        selected = np.isin(
+            np.array([r.id for r in rows], dtype=np.int64),
+            np.array(list(employee_ids), dtype=np.int64),
+        )
+    else:
+        selected = np.ones(len(rows), dtype=bool)
+
+    def _payloads():
+        for i in np.flatnonzero(selected).tolist():
+            r = rows[i]
+            yield _insight_payload(
+                employee_id=r.id,
+                name=r.name,
+                role=r.job_title,
+                department=r.department,
+                run_month=run_month,
+                efficiency_score=r.efficiency_score,
+                dept_eff_avg=float(dept_eff_avg[i]),
+                efficiency_gap_pct=float(efficiency_gap_pct[i]),
+                peer_percentile=r.peer_percentile,
+                hourly_rate=r.hourly_rate,
+                dept_hourly_avg=float(dept_hourly_avg[i]),
+                risk=str(risk[i]),
+                recommendations=_build_recommendations(
+                    str(risk[i]), bool(salary_efficiency_mismatch[i])
+                ),
+            )
+
+    return _payloads()
+
+
+def _classify_risk(efficiency_gap_pct: float) -> str:
+    if efficiency_gap_pct < -20:
+        return "HIGH"
+    if efficiency_gap_pct < -10:
+        return "MEDIUM"
+    return "LOW"
+
+
+def _build_recommendations(risk: str, salary_efficiency_mismatch: bool) -> list:
     recommendations = []
 
     if risk == "HIGH":
@@ -94,26 +237,43 @@ def get_employee_insights(
     if salary_efficiency_mismatch:
         recommendations.append("Compensation vs output review")
 
-    # 7. Final insight payload
+    return recommendations
+
+
+def _insight_payload(
+    employee_id: int,
+    name: str,
+    role: Optional[str],
+    department: str,
+    run_month: str,
+    efficiency_score: float,
+    dept_eff_avg: float,
+    efficiency_gap_pct: float,
+    peer_percentile: float,
+    hourly_rate: float,
+    dept_hourly_avg: float,
+    risk: str,
+    recommendations: list,
+):
     return {
         "employee": {
-            "id": employee.id,
-            "name": employee.name,
-            "role": employee.job_title,
-            "department": employee.department
+            "id": employee_id,
+            "name": name,
+            "role": role,
+            "department": department
         },
         "run_month": run_month,
         "summary": _build_summary(
-            employee.name,
+            name,
             efficiency_gap_pct,
-            metric.peer_percentile
+            peer_percentile
         ),
         "signals": {
-            "efficiency_score": metric.efficiency_score,
+            "efficiency_score": efficiency_score,
             "department_avg_efficiency": round(dept_eff_avg, 2),
             "efficiency_gap_pct": efficiency_gap_pct,
-            "peer_percentile": metric.peer_percentile,
-            "hourly_rate": metric.hourly_rate,
+            "peer_percentile": peer_percentile,
+            "hourly_rate": hourly_rate,
             "department_avg_hourly": round(dept_hourly_avg, 2)
         },
         "risk_flag": risk,
@@ -1,93 +1,159 @@
+import math
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+import numpy as np
 
+from backend.app.db.upsert import bulk_upsert
 from backend.app.models.employee import Employee
-from backend.app.models.payroll import PayrollEntry
 from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.analytics_cache import invalidate_run_month
+from backend.app.services.rollup_service import refresh_department_rollups
+from backend.app.services.person_service import person_key_for_email
+from backend.app.services.quadrant_service import assign_quadrants, save_quadrant_cutoffs
 
 
-def generate_employee_metrics(
-    db: Session,
-    run_month: str,
+def compute_metric_arrays(
+    departments: list,
+    base_salary: np.ndarray,
+    working_hours: np.ndarray,
 ):
     """
-    Safe, idempotent metrics generation.
-    Can be re-run without duplicates.
-    """
+    Vectorized metric pass over one run_month.
 
-    # Fetch all employees for this run
-    employees = (
-        db.query(Employee)
-        .filter(Employee.run_month == run_month)
-        .all()
+    Rows with a missing salary or missing / non-positive working hours
+    get NaN for every metric and are left out of the department means and
+    the percentile ranking.
+
+    Percentile ties: equal hourly rates share the highest rank of their
+    group ("max" method), so the percentile is the share of employees
+    paid at or below this rate.
+    """
+    valid = np.isfinite(base_salary) & np.isfinite(working_hours) & (working_hours > 0)
+    hourly_rate = np.full(base_salary.shape, np.nan)
+    hourly_rate[valid] = base_salary[valid] / working_hours[valid]
+    total = int(np.count_nonzero(valid))
+
+    # Department means via a grouped reduction over integer codes
+    codes = {}
+    dept_idx = np.array(
+        [codes.setdefault(d, len(codes)) for d in departments],
+        dtype=np.int64,
     )
+    dept_sum = np.bincount(dept_idx, weights=np.where(valid, hourly_rate, 0.0))
+    dept_count = np.bincount(dept_idx, weights=valid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dept_avg_hourly = (dept_sum / dept_count)[dept_idx]
 
-    if not employees:
-        return
+    rank = np.searchsorted(np.sort(hourly_rate[valid]), hourly_rate, side="right")
+    peer_percentile = np.where(valid, np.round(rank / max(total, 1) * 100, 2), np.nan)
 
-    # Pre-calc department averages
-    dept_avg = dict(
-        db.query(
-            Employee.department,
-            func.avg(
-                Employee.base_salary / Employee.working_hours
-            ),
-        )
-        .filter(Employee.run_month == run_month)
-        .group_by(Employee.department)
-        .all()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency_score = np.round(hourly_rate / dept_avg_hourly, 2)
+
+    return hourly_rate, dept_avg_hourly, peer_percentile, efficiency_score
+
+
+METRIC_COLUMNS = [
+    "person_key",
+    "hourly_rate",
+    "dept_avg_hourly",
+    "peer_percentile",
+    "efficiency_score",
+    "quadrant",
+]
+
+
+def _nullable(value: float):
+    return value if math.isfinite(value) else None
+
+
+def _upsert_metrics(db: Session, rows: list[dict]):
+    """Bulk upsert keyed on uq_employee_run (employee_id, run_month)."""
+    bulk_upsert(
+        db,
+        EmployeeMetric.__table__,
+        rows,
+        index_elements=["employee_id", "run_month"],
+        update_columns=METRIC_COLUMNS,
     )
 
-    # Get hourly rates ordered (for percentile)
-    hourly_rates = (
+
+def generate_employee_metrics(
+    db: Session,
+    run_month: str,
+):
+    """
+    Safe, idempotent metrics generation.
+    Can be re-run without duplicates; existing rows are refreshed.
+    """
+
+    # Fetch all employees for this run in one pass
+    rows = (
         db.query(
             Employee.id,
-            (Employee.base_salary / Employee.working_hours).label("hourly_rate"),
+            Employee.department,
+            Employee.base_salary,
+            Employee.working_hours,
+            Employee.person_key,
+            Employee.email,
         )
         .filter(Employee.run_month == run_month)
-        .order_by("hourly_rate")
+        .order_by(Employee.id)
         .all()
     )
 
-    rate_rank = {
-        emp_id: idx + 1
-        for idx, (emp_id, _) in enumerate(hourly_rates)
-    }
-    total = len(hourly_rates)
-
-    for emp in employees:
-        hourly_rate = emp.base_salary / emp.working_hours
-        dept_avg_hourly = dept_avg.get(emp.department, hourly_rate)
+    if not rows:
+        return
 
-        percentile = round(
-            (rate_rank[emp.id] / total) * 100, 2
+    emp_ids = [r.id for r in rows]
+    person_keys = [r.person_key or person_key_for_email(r.email) for r in rows]
+    hourly_rate, dept_avg_hourly, peer_percentile, efficiency_score = (
+        compute_metric_arrays(
+            [r.department for r in rows],
+            np.array([r.base_salary for r in rows], dtype=np.float64),
+            np.array([r.working_hours for r in rows], dtype=np.float64),
         )
+    )
 
-        efficiency_score = round(
-            hourly_rate / dept_avg_hourly, 2
+    # Unusable rows keep NULL metrics and no quadrant
+    rated = np.isfinite(hourly_rate)
+    quadrant = np.full(hourly_rate.shape, None, dtype=object)
+    cost_median = efficiency_median = None
+    if rated.any():
+        labels, cost_median, efficiency_median = assign_quadrants(
+            hourly_rate[rated], efficiency_score[rated]
         )
-
-        existing = (
-            db.query(EmployeeMetric)
-            .filter(
-                EmployeeMetric.employee_id == emp.id,
-                EmployeeMetric.run_month == run_month,
+        quadrant[rated] = labels.tolist()
+
+    _upsert_metrics(
+        db,
+        [
+            {
+                "employee_id": emp_id,
+                "run_month": run_month,
+                "person_key": pk,
+                "hourly_rate": _nullable(hr),
+                "dept_avg_hourly": _nullable(da),
+                "peer_percentile": _nullable(pp),
+                "efficiency_score": _nullable(eff),
+                "quadrant": q,
+            }
+            for emp_id, pk, hr, da, pp, eff, q in zip(
+                emp_ids,
+                person_keys,
+                hourly_rate.tolist(),
+                dept_avg_hourly.tolist(),
+                peer_percentile.tolist(),
+                efficiency_score.tolist(),
+                quadrant.tolist(),
             )
-            .first()
-        )
-
-        if existing:
-            continue
-
-        metric = EmployeeMetric(
-            employee_id=emp.id,
-            run_month=run_month,
-            hourly_rate=hourly_rate,
-            dept_avg_hourly=dept_avg_hourly,
-            peer_percentile=percentile,
-            efficiency_score=efficiency_score,
-        )
+        ],
+    )
+    if cost_median is not None:
+        save_quadrant_cutoffs(db, run_month, cost_median, efficiency_median)
+    db.flush()
 
-        db.add(metric)
+    refresh_department_rollups(db, run_month)
 
     db.commit()
+    invalidate_run_month(run_month)
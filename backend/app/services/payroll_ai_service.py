@@ -1,8 +1,6 @@
 from sqlalchemy.orm import Session
 from backend.app.services.payroll_service import get_payroll_run_summary
-from openai import OpenAI
-
-client = OpenAI()
+from backend.app.services.ai_cache_service import cached_completion
 
 def explain_payroll_run(db: Session, run_id: int) -> str:
     summary = get_payroll_run_summary(db, run_id)
@@ -25,11 +23,7 @@ Average risk score: {summary['avg_risk_score']}
 Keep it concise and professional.
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3,
+    return cached_completion(
+        db, "payroll_explanation", prompt, temperature=0.3, run_month=summary["run_month"]
     )
-
-    return response.choices[0].message.content
     
\ No newline at end of file
@@ -0,0 +1,92 @@
+import codecs
+import csv
+from itertools import islice
+from typing import BinaryIO, Iterator
+
+from sqlalchemy.orm import Session
+
+from backend.app.db.upsert import bulk_upsert
+from backend.app.models.employee import Employee
+from backend.app.services.analytics_cache import invalidate_run_month
+from backend.app.services.person_service import person_key_for_email
+
+
+# Rows per batched lookup + bulk write. Bounds memory regardless of file size.
+INGEST_CHUNK_SIZE = 5000
+
+
+def _iter_csv_rows(stream: BinaryIO) -> Iterator[dict]:
+    """
+    Decodes the upload incrementally and yields one dict per CSV row.
+    Only the current line is ever held in memory.
+    """
+    # utf-8-sig also strips a BOM, so the first header name stays clean
+    reader = codecs.getreader("utf-8-sig")(stream)
+    yield from csv.DictReader(reader)
+
+
+def _parse_row(row: dict, run_month: str) -> dict:
+    email = row["email"].strip().lower()
+    return {
+        "run_month": run_month,
+        "email": email,
+        "person_key": person_key_for_email(email),
+        "name": row["name"].strip(),
+        "department": row["department"].strip(),
+        "base_salary": float(row["base_salary"]),
+        "working_hours": float(row.get("working_hours") or 160),
+    }
+
+
+# Columns refreshed when the (run_month, email) snapshot row already exists
+UPSERT_COLUMNS = ["name", "department", "base_salary", "working_hours", "person_key"]
+
+
+def _ingest_chunk(db: Session, run_month: str, rows: list[dict]) -> None:
+    # Last occurrence of an email within the chunk wins (same as row-by-row)
+    by_email = {r["email"]: r for r in rows}
+
+    # One upsert statement against uq_employee_run_month_email;
+    # is_active / simulate_failure only apply to new rows
+    bulk_upsert(
+        db,
+        Employee.__table__,
+        [
+            {**values, "is_active": True, "simulate_failure": False}
+            for values in by_email.values()
+        ],
+        index_elements=["run_month", "email"],
+        update_columns=UPSERT_COLUMNS,
+    )
+
+
+def ingest_payroll_csv(
+    db: Session,
+    run_month: str,
+    stream: BinaryIO,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+) -> int:
+    """
+    Streams a payroll CSV into the employees snapshot for run_month.
+    Rows are processed in fixed-size chunks, one bulk upsert per chunk. Commits once at the end so the upload is atomic.
+    Returns the number of CSV rows processed.
+    """
+    rows = (_parse_row(row, run_month) for row in _iter_csv_rows(stream))
+    processed = 0
+
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            _ingest_chunk(db, run_month, chunk)
+            processed += len(chunk)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    invalidate_run_month(run_month)
+    return processed
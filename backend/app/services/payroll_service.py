@@ -1,7 +1,11 @@
+from datetime import datetime
+from typing import Iterator, Optional
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, insert, or_
+import numpy as np
 
 from backend.app.api import employees
 from backend.app.api import employees
@@ -9,11 +13,13 @@ from backend.app.models.payroll import PayrollRun, PayrollEntry
 from backend.app.models.payslip import Payslip
 from backend.app.models.employee import Employee
 from backend.app.models.audit_log import AuditLog
+from backend.app.models.consolidated_payroll import ConsolidatedPayroll
+from backend.app.db.upsert import bulk_upsert
+from backend.app.services.analytics_cache import invalidate_run_month
 from backend.app.services.metrics_service import generate_employee_metrics
-from backend.app.services.payslip_validation import (
-    validate_payslip,
-    PayslipValidationError,
-)
+from backend.app.services.rollup_service import refresh_rollup_payroll_totals
+from backend.app.services.tax_engine import compute_deductions
+from backend.app.services.payslip_validation import validate_payslip_batch
 
 
 # =========================
@@ -53,8 +59,22 @@ def get_payroll_run_summary(db: Session, run_id: int):
     }
 
 
-def get_payroll_run_entries(db: Session, run_id: int):
-    rows = (
+ENTRY_FIELDS = ["entry_id", "employee_id", "employee_name", "gross_pay", "net_pay", "risk_score"]
+
+
+def _run_entries_query(db: Session, run_id: int):
+    """
+    Entries of a run ordered by (employee name, entry id). Employees are
+    constrained to the run's month so ix_employees_month_name supplies the
+    name order and keyset seeks.
+    """
+    run_month = (
+        db.query(PayrollRun.run_month)
+        .filter(PayrollRun.id == run_id)
+        .scalar()
+    )
+
+    return (
         db.query(
             PayrollEntry.id,
             Employee.id.label("employee_id"),
@@ -64,22 +84,73 @@ def get_payroll_run_entries(db: Session, run_id: int):
             PayrollEntry.risk_score,
         )
         .join(Employee, Employee.id == PayrollEntry.employee_id)
-        .filter(PayrollEntry.payroll_run_id == run_id)
-        .order_by(Employee.name)
-        .all()
+        .filter(
+            PayrollEntry.payroll_run_id == run_id,
+            Employee.run_month == run_month,
+        )
+        .order_by(Employee.name, PayrollEntry.id)
     )
 
-    return [
-        {
-            "entry_id": r.id,
-            "employee_id": r.employee_id,
-            "employee_name": r.employee_name,
-            "gross_pay": float(r.gross_pay),
-            "net_pay": float(r.net_pay),
-            "risk_score": r.risk_score,
-        }
-        for r in rows
-    ]
+
+def _entry_row(r) -> dict:
+    return {
+        "entry_id": r.id,
+        "employee_id": r.employee_id,
+        "employee_name": r.employee_name,
+        "gross_pay": float(r.gross_pay),
+        "net_pay": float(r.net_pay),
+        "risk_score": r.risk_score,
+    }
+
+
+def get_payroll_run_entries(db: Session, run_id: int):
+    return [_entry_row(r) for r in _run_entries_query(db, run_id).all()]
+
+
+def get_payroll_run_entries_page(
+    db: Session,
+    run_id: int,
+    after: Optional[tuple] = None,
+    limit: int = 1000,
+):
+    """
+    One keyset page. after is the (employee_name, entry_id) of the last
+    row already returned. Returns (rows, last key or None on the last page).
+    """
+    q = _run_entries_query(db, run_id)
+    if after is not None:
+        name, entry_id = after
+        q = q.filter(
+            or_(
+                Employee.name > name,
+                and_(Employee.name == name, PayrollEntry.id > entry_id),
+            )
+        )
+
+    results = [_entry_row(r) for r in q.limit(limit).all()]
+
+    next_after = None
+    if len(results) == limit:
+        next_after = (results[-1]["employee_name"], results[-1]["entry_id"])
+    return results, next_after
+
+
+def iter_payroll_run_entries(db: Session, run_id: int, batch_size: int = 1000) -> Iterator[dict]:
+    """Every entry of the run, fetched through a server-side cursor."""
+    q = (
+        _run_entries_query(db, run_id)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    return (_entry_row(r) for r in q)
+
+
+def has_payroll_entries(db: Session, run_id: int) -> bool:
+    return (
+        db.query(PayrollEntry.id)
+        .filter(PayrollEntry.payroll_run_id == run_id)
+        .first()
+    ) is not None
 
 
 # =========================
@@ -90,17 +161,173 @@ class PayrollExecutionError(Exception):
     pass
 
 
-def run_payroll(db: Session, run_month: str, executed_by: str):
-    # 1. Fetch employees snapshot for the month
-    employees = (
-        db.query(Employee)
+def _compute_pay(base_salary: np.ndarray, working_hours: np.ndarray):
+    """
+    Vectorized gross/net computation for a whole run; deductions come
+    from the configured tax table.
+    """
+    gross = base_salary.copy()
+    net, _ = compute_deductions(gross, working_hours)
+    return gross, net
+
+
+# Recomputed pay within this of what was already paid counts as unchanged
+ADJUSTMENT_TOLERANCE = 0.005
+
+
+def _load_run_inputs(db: Session, run_month: str):
+    """Pay inputs of the month's employees as arrays, ordered by employee id."""
+    rows = (
+        db.query(
+            Employee.id,
+            Employee.base_salary,
+            Employee.working_hours,
+            Employee.simulate_failure,
+        )
         .filter(Employee.run_month == run_month)
+        .order_by(Employee.id)
         .all()
     )
 
-    if not employees:
+    if not rows:
         raise ValueError("No employees found for this run_month")
 
+    emp_ids = np.array([r.id for r in rows], dtype=np.int64)
+    base_salary = np.array(
+        [r.base_salary if r.base_salary is not None else np.nan for r in rows],
+        dtype=np.float64,
+    )
+    working_hours = np.array(
+        [r.working_hours if r.working_hours is not None else np.nan for r in rows],
+        dtype=np.float64,
+    )
+    simulate_failure = np.array([bool(r.simulate_failure) for r in rows])
+    return emp_ids, base_salary, working_hours, simulate_failure
+
+
+def _validate_run(base_salary, gross, net, simulate_failure):
+    """
+    Validates every payslip at once. Returns (failed mask, number of
+    validation violations, row -> failure messages).
+    """
+    valid, violations = validate_payslip_batch(base_salary, gross, net)
+
+    failure_reasons = {
+        row: ["Simulated payroll failure"]
+        for row in np.flatnonzero(simulate_failure).tolist()
+    }
+    for v in violations:
+        failure_reasons.setdefault(v["row"], []).append(v["message"])
+
+    return simulate_failure | ~valid, len(violations), failure_reasons
+
+
+def _write_entries_and_payslips(
+    db: Session,
+    payroll_run: PayrollRun,
+    emp_ids: list,
+    base_salary: list,
+    gross: list,
+    net: list,
+    payslip_suffix: str = "",
+    payslip_status: str = "ISSUED",
+):
+    db.execute(
+        insert(PayrollEntry),
+        [
+            {
+                "payroll_run_id": payroll_run.id,
+                "employee_id": emp_id,
+                "gross_pay": g,
+                "net_pay": n,
+            }
+            for emp_id, g, n in zip(emp_ids, gross, net)
+        ],
+    )
+
+    db.execute(
+        insert(Payslip),
+        [
+            {
+                "payslip_number": f"PS-{payroll_run.run_month}-{emp_id}{payslip_suffix}",
+                "employee_id": emp_id,
+                "payroll_run_id": payroll_run.id,
+                "run_month": payroll_run.run_month,
+                "base_salary": b,
+                "gross_pay": g,
+                "net_pay": n,
+                "status": payslip_status,
+            }
+            for emp_id, b, g, n in zip(emp_ids, base_salary, gross, net)
+        ],
+    )
+
+
+def _audit_failures(db: Session, executed_by: str, emp_ids: np.ndarray, failure_reasons: dict):
+    if not failure_reasons:
+        return
+
+    db.execute(
+        insert(AuditLog),
+        [
+            {
+                "action": "PAYROLL_FAILED",
+                "performed_by": executed_by,
+                "reference_id": int(emp_ids[row]),
+                "details": "; ".join(messages),
+            }
+            for row, messages in sorted(failure_reasons.items())
+        ],
+    )
+
+
+def get_base_payroll_run(db: Session, run_month: str) -> Optional[PayrollRun]:
+    return (
+        db.query(PayrollRun)
+        .filter(
+            PayrollRun.run_month == run_month,
+            PayrollRun.parent_run_id.is_(None),
+        )
+        .order_by(PayrollRun.id)
+        .first()
+    )
+
+
+def run_payroll(
+    db: Session,
+    run_month: str,
+    executed_by: str,
+    generate_metrics: bool = True,
+    adjustment: bool = False,
+):
+    """
+    Base payroll run for run_month. With adjustment=True, an adjustment
+    run against the month's base run instead (see run_payroll_adjustment).
+    """
+    if adjustment:
+        return run_payroll_adjustment(db, run_month, executed_by)
+
+    run_id = write_base_payroll_run(db, run_month, executed_by)
+    db.commit()
+    invalidate_run_month(run_month)
+
+    if generate_metrics:
+        try:
+            generate_employee_metrics(db, run_month)
+        except Exception as e:
+            print(f"[WARN] Metrics generation failed: {e}")
+
+    return run_id
+
+
+def write_base_payroll_run(db: Session, run_month: str, executed_by: str) -> int:
+    """
+    Writes the base payroll run for run_month and returns its id. The
+    caller commits, so it can record the run in the same transaction.
+    """
+    # 1. Fetch employees snapshot for the month (columns only, no ORM objects)
+    emp_ids, base_salary, working_hours, simulate_failure = _load_run_inputs(db, run_month)
+
     # 2. Prevent duplicate payroll runs
     existing = (
         db.query(PayrollRun)
@@ -118,84 +345,317 @@ def run_payroll(db: Session, run_month: str, executed_by: str):
     db.add(payroll_run)
     db.flush()  # get payroll_run.id
 
-    failed = 0
-    total_gross = 0.0
+    # 4. Compute the whole run as arrays
+    gross, net = _compute_pay(base_salary, working_hours)
 
-    # 4. Execute payroll
-    for emp in employees:
-        try:
-            gross = emp.base_salary
-            net = gross  # keep simple for now
-
-            entry = PayrollEntry(
-                payroll_run_id=payroll_run.id,
-                employee_id=emp.id,
-                gross_pay=gross,
-                net_pay=net,
-            )
-            db.add(entry)
-
-            payslip = Payslip(
-                payslip_number=f"PS-{run_month}-{emp.id}",
-                employee_id=emp.id,
-                payroll_run_id=payroll_run.id,
-                run_month=run_month,
-                base_salary=emp.base_salary,
-                gross_pay=gross,
-                net_pay=net,
-                status="ISSUED",
-            )
-            db.add(payslip)
+    # 5. Validate every payslip at once; invalid rows are skipped and audited
+    failed_mask, violation_count, failure_reasons = _validate_run(
+        base_salary, gross, net, simulate_failure
+    )
+    ok = ~failed_mask
 
-            total_gross += gross
+    ok_ids = emp_ids[ok].tolist()
+    ok_gross = gross[ok].tolist()
+    ok_net = net[ok].tolist()
 
-        except Exception as e:
-            failed += 1
-            db.add(AuditLog(
-                action="PAYROLL_FAILED",
-                performed_by=executed_by,
-                reference_id=emp.id,
-                details=str(e)
-            ))
-
-    # 5. Finalize run
-    payroll_run.total_amount = total_gross
+    # 6. Bulk write entries, payslips, consolidated totals and failure audit rows
+    if ok_ids:
+        _write_entries_and_payslips(
+            db, payroll_run, ok_ids, base_salary[ok].tolist(), ok_gross, ok_net
+        )
+        db.execute(
+            insert(ConsolidatedPayroll),
+            [
+                {
+                    "base_run_id": payroll_run.id,
+                    "employee_id": emp_id,
+                    "total_gross": g,
+                    "total_net": n,
+                    "adjustment_count": 0,
+                    "last_run_id": payroll_run.id,
+                }
+                for emp_id, g, n in zip(ok_ids, ok_gross, ok_net)
+            ],
+        )
+
+    _audit_failures(db, executed_by, emp_ids, failure_reasons)
+
+    # 7. Finalize run
+    failed = int(failed_mask.sum())
+    payroll_run.total_amount = float(gross[ok].sum())
     payroll_run.status = "COMPLETED_WITH_ERRORS" if failed else "COMPLETED"
 
     db.add(AuditLog(
         action="PAYROLL_EXECUTED",
         performed_by=executed_by,
-        reference_id=payroll_run.id
+        reference_id=payroll_run.id,
+        details=(
+            f"{failed} of {len(emp_ids)} payslips failed "
+            f"({violation_count} validation violations)"
+            if failed else None
+        ),
+    ))
+
+    refresh_rollup_payroll_totals(db, run_month)
+    return payroll_run.id
+
+
+def run_payroll_adjustment(db: Session, run_month: str, executed_by: str):
+    """
+    Adjustment run against the month's base run. Pay is recomputed for
+    the current employees snapshot and compared with what the base run
+    and earlier adjustments already paid (consolidated_payroll); only
+    employees whose pay changed get an entry, holding the delta, and an
+    adjustment payslip. Returns the new run id.
+
+    Raises ValueError when no employee has a payable change, including
+    when every changed employee fails validation; nothing is written then.
+    Employees paid earlier but missing from the snapshot get no reversal:
+    ingest only upserts snapshot rows and payroll entries reference them,
+    so a paid employee cannot leave the month.
+    """
+    # 1. Base run and what has been paid against it so far
+    base_run = get_base_payroll_run(db, run_month)
+    if base_run is None:
+        raise ValueError("No base payroll run to adjust for this run_month")
+
+    ensure_consolidated_payroll(db, base_run.id)
+
+    paid = (
+        db.query(
+            ConsolidatedPayroll.employee_id,
+            ConsolidatedPayroll.total_gross,
+            ConsolidatedPayroll.total_net,
+            ConsolidatedPayroll.adjustment_count,
+        )
+        .filter(ConsolidatedPayroll.base_run_id == base_run.id)
+        .order_by(ConsolidatedPayroll.employee_id)
+        .all()
+    )
+
+    # 2. Recompute the month and line it up with the paid totals
+    emp_ids, base_salary, working_hours, simulate_failure = _load_run_inputs(db, run_month)
+    gross, net = _compute_pay(base_salary, working_hours)
+
+    was_paid = np.zeros(len(emp_ids), dtype=bool)
+    paid_gross = np.zeros(len(emp_ids))
+    paid_net = np.zeros(len(emp_ids))
+    adjustment_count = np.zeros(len(emp_ids), dtype=np.int64)
+
+    if paid:
+        paid_ids = np.array([r.employee_id for r in paid], dtype=np.int64)
+        pos = np.searchsorted(paid_ids, emp_ids).clip(max=len(paid_ids) - 1)
+        was_paid = paid_ids[pos] == emp_ids
+
+        paid_gross = np.where(was_paid, np.array([r.total_gross for r in paid])[pos], 0.0)
+        paid_net = np.where(was_paid, np.array([r.total_net for r in paid])[pos], 0.0)
+        adjustment_count = np.where(
+            was_paid, np.array([r.adjustment_count for r in paid], dtype=np.int64)[pos], 0
+        )
+
+    # 3. Only employees whose pay changed (or who were never paid) are touched
+    with np.errstate(invalid="ignore"):
+        changed = (
+            ~was_paid
+            | (np.abs(gross - paid_gross) > ADJUSTMENT_TOLERANCE)
+            | (np.abs(net - paid_net) > ADJUSTMENT_TOLERANCE)
+        )
+    if not changed.any():
+        raise ValueError("No pay changes to adjust for this run_month")
+
+    idx = np.flatnonzero(changed)
+    emp_ids = emp_ids[idx]
+    base_salary, gross, net = base_salary[idx], gross[idx], net[idx]
+    paid_gross, paid_net = paid_gross[idx], paid_net[idx]
+    adjustment_count = adjustment_count[idx]
+
+    # 4. Validate the corrected pay, not the deltas
+    failed_mask, violation_count, failure_reasons = _validate_run(
+        base_salary, gross, net, simulate_failure[idx]
+    )
+    ok = ~failed_mask
+
+    # Employees that never validate would otherwise open an empty run per call
+    if not ok.any():
+        raise ValueError(
+            f"No payable pay changes to adjust for this run_month "
+            f"({int(failed_mask.sum())} changed employees fail validation)"
+        )
+
+    payroll_run = PayrollRun(
+        run_month=run_month,
+        status="PROCESSING",
+        parent_run_id=base_run.id,
+    )
+    db.add(payroll_run)
+    db.flush()
+
+    # 5. Delta entries and payslips, new consolidated totals, failure audit rows
+    delta_gross = np.round(gross - paid_gross, 2)
+    delta_net = np.round(net - paid_net, 2)
+
+    ok_ids = emp_ids[ok].tolist()
+    if ok_ids:
+        _write_entries_and_payslips(
+            db,
+            payroll_run,
+            ok_ids,
+            base_salary[ok].tolist(),
+            delta_gross[ok].tolist(),
+            delta_net[ok].tolist(),
+            payslip_suffix=f"-A{payroll_run.id}",
+            payslip_status="ADJUSTMENT",
+        )
+        bulk_upsert(
+            db,
+            ConsolidatedPayroll.__table__,
+            [
+                {
+                    "base_run_id": base_run.id,
+                    "employee_id": emp_id,
+                    "total_gross": g,
+                    "total_net": n,
+                    "adjustment_count": int(c) + 1,
+                    "last_run_id": payroll_run.id,
+                    "updated_at": datetime.utcnow(),
+                }
+                for emp_id, g, n, c in zip(
+                    ok_ids,
+                    gross[ok].tolist(),
+                    net[ok].tolist(),
+                    adjustment_count[ok].tolist(),
+                )
+            ],
+            index_elements=["base_run_id", "employee_id"],
+            update_columns=["total_gross", "total_net", "adjustment_count", "last_run_id", "updated_at"],
+        )
+
+    _audit_failures(db, executed_by, emp_ids, failure_reasons)
+
+    # 6. Finalize run
+    failed = int(failed_mask.sum())
+    payroll_run.total_amount = float(delta_gross[ok].sum())
+    payroll_run.status = "COMPLETED_WITH_ERRORS" if failed else "COMPLETED"
+
+    db.add(AuditLog(
+        action="PAYROLL_ADJUSTED",
+        performed_by=executed_by,
+        reference_id=payroll_run.id,
+        details=(
+            f"Adjusted {len(ok_ids)} employees against run {base_run.id}"
+            + (f"; {failed} failed ({violation_count} validation violations)" if failed else "")
+        ),
     ))
 
+    refresh_rollup_payroll_totals(db, run_month)
     db.commit()
+    invalidate_run_month(run_month)
 
-    try:
-        generate_employee_metrics(db, run_month)
-    except Exception as e:
-        print(f"[WARN] Metrics generation failed: {e}")
-    
     return payroll_run.id
 
 # =========================
 # CONSOLIDATION
 # =========================
 
-def get_consolidated_payroll(db: Session, base_run_id: int):
-    rows = (
+def _entry_totals(db: Session, base_run_id: int):
+    """Per-employee totals of a base run and its adjustments, aggregated from entries."""
+    return (
         db.query(
-            Employee.id.label("employee_id"),
-            Employee.name.label("employee_name"),
+            PayrollEntry.employee_id,
             func.sum(PayrollEntry.gross_pay).label("total_gross"),
             func.sum(PayrollEntry.net_pay).label("total_net"),
+            func.sum(
+                case((PayrollEntry.payroll_run_id != base_run_id, 1), else_=0)
+            ).label("adjustment_count"),
+            func.max(PayrollEntry.payroll_run_id).label("last_run_id"),
         )
-        .join(PayrollEntry, PayrollEntry.employee_id == Employee.id)
         .join(PayrollRun, PayrollRun.id == PayrollEntry.payroll_run_id)
         .filter(
             (PayrollRun.id == base_run_id)
             | (PayrollRun.parent_run_id == base_run_id)
         )
-        .group_by(Employee.id, Employee.name)
+        .group_by(PayrollEntry.employee_id)
+    )
+
+
+def _has_consolidated_payroll(db: Session, base_run_id: int) -> bool:
+    return (
+        db.query(ConsolidatedPayroll.id)
+        .filter(ConsolidatedPayroll.base_run_id == base_run_id)
+        .first()
+    ) is not None
+
+
+def ensure_consolidated_payroll(db: Session, base_run_id: int):
+    """
+    Builds consolidated_payroll for a base run written before the table
+    existed, from its entries and its adjustment runs' entries. Flushes
+    only; the caller commits.
+    """
+    if _has_consolidated_payroll(db, base_run_id):
+        return
+
+    rows = _entry_totals(db, base_run_id).all()
+    if not rows:
+        return
+
+    db.execute(
+        insert(ConsolidatedPayroll),
+        [
+            {
+                "base_run_id": base_run_id,
+                "employee_id": r.employee_id,
+                "total_gross": float(r.total_gross),
+                "total_net": float(r.total_net),
+                "adjustment_count": int(r.adjustment_count),
+                "last_run_id": r.last_run_id,
+            }
+            for r in rows
+        ],
+    )
+    db.flush()
+
+
+def get_consolidated_payroll(db: Session, base_run_id: int):
+    """
+    Per-employee totals of a base run and its adjustments, read from
+    consolidated_payroll. An adjustment run id resolves to its base run.
+    Runs from before the table existed are aggregated from their entries
+    without writing; the next adjustment run stores them.
+    """
+    run = (
+        db.query(PayrollRun.id, PayrollRun.parent_run_id)
+        .filter(PayrollRun.id == base_run_id)
+        .first()
+    )
+    if run is None:
+        return []
+
+    base_run_id = run.parent_run_id or run.id
+
+    if _has_consolidated_payroll(db, base_run_id):
+        totals = (
+            db.query(
+                ConsolidatedPayroll.employee_id,
+                ConsolidatedPayroll.total_gross,
+                ConsolidatedPayroll.total_net,
+                ConsolidatedPayroll.adjustment_count,
+            )
+            .filter(ConsolidatedPayroll.base_run_id == base_run_id)
+            .subquery()
+        )
+    else:
+        totals = _entry_totals(db, base_run_id).subquery()
+
+    rows = (
+        db.query(
+            Employee.id.label("employee_id"),
+            Employee.name.label("employee_name"),
+            totals.c.total_gross,
+            totals.c.total_net,
+            totals.c.adjustment_count,
+        )
+        .join(totals, totals.c.employee_id == Employee.id)
         .order_by(Employee.name)
         .all()
     )
@@ -206,6 +666,7 @@ def get_consolidated_payroll(db: Session, base_run_id: int):
             "employee_name": r.employee_name,
             "total_gross": float(r.total_gross),
             "total_net": float(r.total_net),
+            "adjustments": int(r.adjustment_count),
         }
         for r in rows
     ]
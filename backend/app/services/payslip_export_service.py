@@ -0,0 +1,262 @@
+import multiprocessing
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.employee import Employee
+from backend.app.models.payslip import Payslip
+
+
+class PayslipExportError(Exception):
+    pass
+
+
+PAYSLIP_EXPORT_FIELDS = [
+    "payslip_number",
+    "employee_id",
+    "employee_name",
+    "department",
+    "run_month",
+    "base_salary",
+    "gross_pay",
+    "net_pay",
+    "status",
+    "generated_at",
+]
+
+
+# =========================
+# SOURCE
+# =========================
+
+def has_payslips(db: Session, run_id: int) -> bool:
+    return (
+        db.query(Payslip.id)
+        .filter(Payslip.payroll_run_id == run_id)
+        .first()
+    ) is not None
+
+
+def iter_payslip_rows(db: Session, run_id: int, batch_size: int = 1000) -> Iterator[dict]:
+    """Every payslip of the run through one server-side cursor, in payslip order."""
+    q = (
+        db.query(
+            Payslip.payslip_number,
+            Payslip.employee_id,
+            Employee.name.label("employee_name"),
+            Employee.department,
+            Payslip.run_month,
+            Payslip.base_salary,
+            Payslip.gross_pay,
+            Payslip.net_pay,
+            Payslip.status,
+            Payslip.generated_at,
+        )
+        .join(Employee, Employee.id == Payslip.employee_id)
+        .filter(Payslip.payroll_run_id == run_id)
+        .order_by(Payslip.id)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    return (r._asdict() for r in q)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class _ChunkSink:
+    """
+    Write-only, non-seekable file object. Writers append to it and the
+    generator drains it after each batch, so only one batch of output is
+    buffered at a time.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# =========================
+# COLUMNAR (pyarrow)
+# =========================
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise PayslipExportError("Columnar export needs pyarrow installed")
+    return pyarrow
+
+
+def ensure_columnar_support():
+    _pyarrow()
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("payslip_number", pa.string()),
+        ("employee_id", pa.int64()),
+        ("employee_name", pa.string()),
+        ("department", pa.string()),
+        ("run_month", pa.string()),
+        ("base_salary", pa.float64()),
+        ("gross_pay", pa.float64()),
+        ("net_pay", pa.float64()),
+        ("status", pa.string()),
+        ("generated_at", pa.timestamp("us")),
+    ])
+
+
+def iter_columnar_export(rows: Iterable[dict], fmt: str, batch_size: int = 10000) -> Iterator[bytes]:
+    """
+    Parquet ("parquet", one row group per batch) or Arrow IPC stream
+    ("arrow", one record batch per batch) bytes.
+    """
+    pa = _pyarrow()
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for batch in _batches(rows, batch_size):
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+# =========================
+# ZIP OF DOCUMENTS
+# =========================
+
+def render_payslip_document(row: dict) -> tuple:
+    """(file name, text) of one payslip. Runs in the render worker processes."""
+    deductions = row["gross_pay"] - row["net_pay"]
+    text = (
+        f"PAYSLIP {row['payslip_number']}\n"
+        f"{'=' * 40}\n"
+        f"Employee:    {row['employee_name']} (#{row['employee_id']})\n"
+        f"Department:  {row['department']}\n"
+        f"Period:      {row['run_month']}\n"
+        f"Status:      {row['status']}\n"
+        f"{'-' * 40}\n"
+        f"Base salary: {row['base_salary']:>14,.2f}\n"
+        f"Gross pay:   {row['gross_pay']:>14,.2f}\n"
+        f"Deductions:  {deductions:>14,.2f}\n"
+        f"Net pay:     {row['net_pay']:>14,.2f}\n"
+    )
+    return f"{row['payslip_number']}.txt", text
+
+
+def render_payslip_batch(rows: list) -> list:
+    """Renders one batch; a single task per batch for the render workers."""
+    return [render_payslip_document(row) for row in rows]
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """
+    Render workers shared by every export, started on first use and
+    stopped by shutdown_render_pool() at application shutdown.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # spawn: the request thread must not fork a threaded server process
+            _render_pool = ProcessPoolExecutor(
+                max_workers=settings.PAYSLIP_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _render_pool
+
+
+def shutdown_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(cancel_futures=True)
+            _render_pool = None
+
+
+def _rendered_batches(rows: Iterable[dict], batch_size: int) -> Iterator[list]:
+    """
+    Rendered documents, one list per batch, in row order. The first
+    PAYSLIP_RENDER_INLINE_ROWS rows are rendered in this thread, so small
+    exports never pay for process hand-off; past that, batches go to the
+    shared render pool with a few in flight while the next ones are read.
+    """
+    workers = settings.PAYSLIP_RENDER_WORKERS
+    inline_rows = settings.PAYSLIP_RENDER_INLINE_ROWS
+    in_flight = deque()
+    seen = 0
+
+    try:
+        for batch in _batches(rows, batch_size):
+            if workers <= 1 or seen < inline_rows:
+                seen += len(batch)
+                yield render_payslip_batch(batch)
+                continue
+
+            in_flight.append(_get_render_pool().submit(render_payslip_batch, batch))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+    finally:
+        # Client went away or a batch failed: drop work nobody will read
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_zip_export(rows: Iterable[dict], batch_size: int = 500) -> Iterator[bytes]:
+    """
+    ZIP archive with one document per payslip, written to a non-seekable
+    sink (sizes go into data descriptors) so it streams as it is built.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for documents in _rendered_batches(rows, batch_size):
+            for filename, text in documents:
+                archive.writestr(filename, text)
+            yield sink.drain()
+    yield sink.drain()
@@ -1,7 +1,19 @@
+import numpy as np
+
+
 class PayslipValidationError(Exception):
     pass
 
 
+# (rule code, message), in the order violations are reported per row
+PAYSLIP_RULES = [
+    ("BASE_SALARY_MISSING", "Base salary missing"),
+    ("GROSS_NOT_POSITIVE", "Gross pay must be > 0"),
+    ("NET_NEGATIVE", "Net pay cannot be negative"),
+    ("NET_EXCEEDS_GROSS", "Net pay cannot exceed gross"),
+]
+
+
 def validate_payslip(employee, gross: float, net: float):
     if employee.base_salary is None:
         raise PayslipValidationError("Base salary missing")
@@ -16,3 +28,45 @@ def validate_payslip(employee, gross: float, net: float):
         raise PayslipValidationError("Net pay cannot exceed gross")
 
     # future rules go here
+
+
+def _value(x: float):
+    return float(x) if np.isfinite(x) else None
+
+
+def validate_payslip_batch(
+    base_salary: np.ndarray,
+    gross: np.ndarray,
+    net: np.ndarray,
+):
+    """
+    Checks every PAYSLIP_RULES rule for a whole run in one pass.
+
+    Returns (valid mask, violations); violations has one dict per failed
+    (row, rule) with the row's values, ordered by row. A row with a
+    missing base salary only reports that rule.
+    """
+    has_base = np.isfinite(base_salary)
+
+    # One boolean column per rule, in PAYSLIP_RULES order
+    failed = np.column_stack([
+        ~has_base,
+        has_base & ~(gross > 0),
+        has_base & (net < 0),
+        has_base & (net > gross),
+    ])
+    valid = ~failed.any(axis=1)
+
+    rows, rules = np.nonzero(failed)
+    violations = [
+        {
+            "row": row,
+            "rule": PAYSLIP_RULES[rule][0],
+            "message": PAYSLIP_RULES[rule][1],
+            "base_salary": _value(base_salary[row]),
+            "gross_pay": _value(gross[row]),
+            "net_pay": _value(net[row]),
+        }
+        for row, rule in zip(rows.tolist(), rules.tolist())
+    ]
+    return valid, violations
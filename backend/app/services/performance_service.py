@@ -0,0 +1,103 @@
+from typing import Iterator, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from backend.app.models.employee import Employee
+from backend.app.models.performance import PerformanceReview
+
+
+def _snapshot_query(
+    db: Session,
+    quarter: int,
+    year: int,
+    run_month: Optional[str],
+    person_key: Optional[str],
+):
+    """
+    Employees LEFT JOIN their review for (year, quarter), resolved through
+    ix_performance_reviews_employee_period instead of a query per employee.
+    """
+    q = (
+        db.query(
+            Employee.id.label("employee_id"),
+            Employee.name,
+            Employee.department,
+            Employee.job_title,
+            PerformanceReview.rating,
+            PerformanceReview.id.label("review_id"),
+        )
+        .outerjoin(
+            PerformanceReview,
+            and_(
+                PerformanceReview.employee_id == Employee.id,
+                PerformanceReview.year == year,
+                PerformanceReview.quarter == quarter,
+            ),
+        )
+    )
+
+    if run_month:
+        q = q.filter(Employee.run_month == run_month)
+    if person_key:
+        q = q.filter(Employee.person_key == person_key)
+
+    return q.order_by(Employee.id, PerformanceReview.id)
+
+
+def _snapshot_rows(rows) -> Iterator[dict]:
+    # An employee with several reviews in the quarter keeps the first one
+    last_id = None
+    for r in rows:
+        if r.employee_id == last_id:
+            continue
+        last_id = r.employee_id
+        yield {
+            "employee_id": r.employee_id,
+            "name": r.name,
+            "department": r.department,
+            "job_title": r.job_title,
+            "rating": r.rating if r.review_id else None,
+            "status": "Completed" if r.review_id else "Pending"
+        }
+
+
+def get_performance_snapshot_page(
+    db: Session,
+    quarter: int,
+    year: int,
+    run_month: Optional[str] = None,
+    person_key: Optional[str] = None,
+    after_employee_id: Optional[int] = None,
+    limit: int = 500,
+):
+    """
+    One keyset page ordered by employee id.
+    Returns (rows, last_employee_id or None when this was the last page).
+    """
+    q = _snapshot_query(db, quarter, year, run_month, person_key)
+    if after_employee_id is not None:
+        q = q.filter(Employee.id > after_employee_id)
+
+    rows = q.limit(limit).all()
+    results = list(_snapshot_rows(rows))
+
+    next_after = results[-1]["employee_id"] if len(rows) == limit else None
+    return results, next_after
+
+
+def iter_performance_snapshots(
+    db: Session,
+    quarter: int,
+    year: int,
+    run_month: Optional[str] = None,
+    person_key: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[dict]:
+    """Every snapshot row, fetched through a server-side cursor."""
+    q = (
+        _snapshot_query(db, quarter, year, run_month, person_key)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    return _snapshot_rows(q)
@@ -0,0 +1,98 @@
+import hashlib
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.employee import Employee
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.models.department_metric_rollup import DepartmentMetricRollup
+
+
+def person_key_for_email(email: str) -> str:
+    """
+    Stable identity of a person across monthly snapshots. Each run_month
+    creates new Employee rows, but the normalized email stays the same.
+    The key is its SHA-256 hex digest, so it can go in URLs and logs
+    without exposing the address.
+    """
+    return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+
+
+def get_person_key(db: Session, employee_id: int) -> Optional[str]:
+    row = (
+        db.query(Employee.person_key, Employee.email)
+        .filter(Employee.id == employee_id)
+        .first()
+    )
+    if not row:
+        return None
+    return row.person_key or person_key_for_email(row.email)
+
+
+def person_metric_series(
+    db: Session,
+    person_key: str,
+    start_month: Optional[str] = None,
+    end_month: Optional[str] = None,
+):
+    """
+    Month-by-month metrics for one person. A single range scan on
+    ix_employee_metrics_person_month (person_key, run_month).
+    """
+    q = db.query(
+        EmployeeMetric.run_month,
+        EmployeeMetric.employee_id,
+        EmployeeMetric.efficiency_score,
+        EmployeeMetric.hourly_rate,
+        EmployeeMetric.peer_percentile,
+    ).filter(EmployeeMetric.person_key == person_key)
+
+    if start_month:
+        q = q.filter(EmployeeMetric.run_month >= start_month)
+    if end_month:
+        q = q.filter(EmployeeMetric.run_month <= end_month)
+
+    return [
+        {
+            "run_month": r.run_month,
+            "employee_id": r.employee_id,
+            "efficiency": r.efficiency_score,
+            "hourly_rate": r.hourly_rate,
+            "peer_percentile": r.peer_percentile,
+        }
+        for r in q.order_by(EmployeeMetric.run_month).all()
+    ]
+
+
+def department_metric_series(
+    db: Session,
+    department: str,
+    start_month: Optional[str] = None,
+    end_month: Optional[str] = None,
+):
+    """
+    Month-by-month aggregates for one department. A single range scan on
+    ix_rollup_department_month (department, run_month).
+    """
+    q = db.query(DepartmentMetricRollup).filter(
+        DepartmentMetricRollup.department == department
+    )
+
+    if start_month:
+        q = q.filter(DepartmentMetricRollup.run_month >= start_month)
+    if end_month:
+        q = q.filter(DepartmentMetricRollup.run_month <= end_month)
+
+    return [
+        {
+            "run_month": r.run_month,
+            "headcount": r.headcount,
+            "avg_efficiency": round(r.avg_efficiency, 2),
+            "median_efficiency": round(r.median_efficiency, 2),
+            "p10_efficiency": round(r.p10_efficiency, 2),
+            "p90_efficiency": round(r.p90_efficiency, 2),
+            "avg_hourly_rate": round(r.avg_hourly_rate, 2),
+            "total_gross_pay": round(r.total_gross_pay, 2),
+        }
+        for r in q.order_by(DepartmentMetricRollup.run_month).all()
+    ]
@@ -0,0 +1,287 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session, selectinload
+
+from backend.app.core import worker_pool
+from backend.app.core.config import settings
+from backend.app.db.session import SessionLocal
+from backend.app.models.pipeline_job import PipelineJob, PipelineStage
+from backend.app.services.metrics_service import generate_employee_metrics
+from backend.app.services.payroll_ingest_service import ingest_payroll_csv
+from backend.app.services.payroll_service import get_base_payroll_run, write_base_payroll_run
+from backend.app.services.run_state_service import (
+    mark_csv_uploaded,
+    mark_payroll_done,
+    mark_metrics_done,
+)
+
+
+STAGES = ["INGEST", "PAYROLL", "METRICS"]
+
+
+class PipelineJobError(Exception):
+    pass
+
+
+# =========================
+# STAGES
+# =========================
+
+def _stage_ingest(db: Session, job: PipelineJob) -> str:
+    if not job.source_path or not os.path.exists(job.source_path):
+        raise PipelineJobError("Uploaded CSV is no longer available; re-upload the file")
+
+    with open(job.source_path, "rb") as fh:
+        loaded = ingest_payroll_csv(db, job.run_month, fh)
+
+    mark_csv_uploaded(db, job.run_month)
+
+    os.remove(job.source_path)
+    job.source_path = None
+    return f"employees_loaded={loaded}"
+
+
+def _stage_payroll(db: Session, job: PipelineJob) -> str:
+    # The run is committed together with job.payroll_run_id; a retry of
+    # this job after that point picks up its own run instead of failing
+    if job.payroll_run_id is not None:
+        mark_payroll_done(db, job.run_month)
+        return f"payroll_run_id={job.payroll_run_id} (existing)"
+
+    # Payroll of an earlier upload must not be passed off as this one's
+    if get_base_payroll_run(db, job.run_month) is not None:
+        raise PipelineJobError(
+            f"Payroll already executed for {job.run_month}; "
+            "use an adjustment run to apply this upload"
+        )
+
+    job.payroll_run_id = write_base_payroll_run(db, job.run_month, job.executed_by)
+    mark_payroll_done(db, job.run_month)
+    return f"payroll_run_id={job.payroll_run_id}"
+
+
+def _stage_metrics(db: Session, job: PipelineJob) -> str:
+    generate_employee_metrics(db, job.run_month)
+    mark_metrics_done(db, job.run_month)
+    return "metrics generated"
+
+
+STAGE_HANDLERS = {
+    "INGEST": _stage_ingest,
+    "PAYROLL": _stage_payroll,
+    "METRICS": _stage_metrics,
+}
+
+
+# =========================
+# JOB LIFECYCLE
+# =========================
+
+def spool_upload(stream: BinaryIO) -> str:
+    """
+    Copies the request body to disk in fixed-size blocks so the HTTP
+    request can return before ingestion starts.
+    """
+    fd, path = tempfile.mkstemp(
+        prefix="payroll-",
+        suffix=".csv",
+        dir=settings.UPLOAD_SPOOL_DIR,
+    )
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(stream, out, length=1024 * 1024)
+    return path
+
+
+def create_pipeline_job(
+    db: Session,
+    run_month: str,
+    executed_by: str,
+    source_path: str,
+) -> PipelineJob:
+    job = PipelineJob(
+        run_month=run_month,
+        executed_by=executed_by,
+        status="QUEUED",
+        source_path=source_path,
+        stages=[
+            PipelineStage(stage=name, position=idx, status="PENDING", attempts=0)
+            for idx, name in enumerate(STAGES)
+        ],
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def enqueue_pipeline_job(job_id: int):
+    return worker_pool.submit(run_pipeline_job, job_id)
+
+
+def run_pipeline_job(job_id: int):
+    """
+    Worker entry point. Runs every stage that is not DONE yet, in order,
+    and stops at the first failure so it can be retried from there.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(PipelineJob, job_id)
+        if not job:
+            return
+
+        job.status = "RUNNING"
+        job.error = None
+        job.heartbeat_at = datetime.utcnow()
+        db.commit()
+
+        for stage in job.stages:
+            if stage.status == "DONE":
+                continue
+
+            stage.status = "RUNNING"
+            stage.attempts += 1
+            stage.started_at = datetime.utcnow()
+            stage.finished_at = None
+            stage.detail = None
+            job.heartbeat_at = stage.started_at
+            db.commit()
+
+            start = time.perf_counter()
+            try:
+                detail = STAGE_HANDLERS[stage.stage](db, job)
+            except Exception as e:
+                db.rollback()
+                stage.status = "FAILED"
+                stage.detail = str(e)
+                stage.finished_at = datetime.utcnow()
+                stage.duration_ms = int((time.perf_counter() - start) * 1000)
+                job.status = "FAILED"
+                job.error = f"{stage.stage}: {e}"
+                db.commit()
+                return
+
+            stage.status = "DONE"
+            stage.detail = detail
+            stage.finished_at = datetime.utcnow()
+            stage.duration_ms = int((time.perf_counter() - start) * 1000)
+            job.heartbeat_at = stage.finished_at
+            db.commit()
+
+        job.status = "COMPLETED"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def fail_interrupted_pipeline_jobs(db: Session) -> int:
+    """
+    Called at startup. Jobs still QUEUED or RUNNING whose heartbeat is
+    older than PIPELINE_STALE_AFTER_SECONDS were owned by a process that
+    is gone; mark them FAILED so they can be retried. Jobs of workers
+    still alive elsewhere keep a fresh heartbeat and are left alone.
+    Returns the number of jobs marked.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.PIPELINE_STALE_AFTER_SECONDS)
+
+    jobs = (
+        db.query(PipelineJob)
+        .options(selectinload(PipelineJob.stages))
+        .filter(
+            PipelineJob.status.in_(["QUEUED", "RUNNING"]),
+            PipelineJob.heartbeat_at < stale_before,
+        )
+        .all()
+    )
+
+    for job in jobs:
+        for stage in job.stages:
+            if stage.status == "RUNNING":
+                stage.status = "FAILED"
+                stage.detail = "Interrupted by a restart"
+                stage.finished_at = now
+        job.status = "FAILED"
+        job.error = "Interrupted by a restart; retry to resume"
+
+    db.commit()
+    return len(jobs)
+
+
+def retry_pipeline_job(db: Session, job_id: int) -> PipelineJob:
+    job = db.get(PipelineJob, job_id)
+    if not job:
+        raise PipelineJobError("Pipeline job not found")
+    if job.status != "FAILED":
+        raise PipelineJobError(f"Only FAILED jobs can be retried (status is {job.status})")
+
+    # Finished stages stay DONE and are skipped by the worker
+    for stage in job.stages:
+        if stage.status == "FAILED":
+            stage.status = "PENDING"
+
+    job.status = "QUEUED"
+    job.error = None
+    job.heartbeat_at = datetime.utcnow()
+    db.commit()
+
+    enqueue_pipeline_job(job.id)
+    return job
+
+
+# =========================
+# READ QUERIES
+# =========================
+
+def _job_payload(job: PipelineJob):
+    done = sum(1 for s in job.stages if s.status == "DONE")
+
+    return {
+        "job_id": job.id,
+        "run_month": job.run_month,
+        "status": job.status,
+        "error": job.error,
+        "payroll_run_id": job.payroll_run_id,
+        "progress": {
+            "completed_stages": done,
+            "total_stages": len(job.stages),
+        },
+        "stages": [
+            {
+                "stage": s.stage,
+                "status": s.status,
+                "attempts": s.attempts,
+                "detail": s.detail,
+                "started_at": s.started_at,
+                "finished_at": s.finished_at,
+                "duration_ms": s.duration_ms,
+            }
+            for s in job.stages
+        ],
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def get_pipeline_job_status(db: Session, job_id: int):
+    job = db.get(PipelineJob, job_id)
+    if not job:
+        return None
+    return _job_payload(job)
+
+
+def list_pipeline_jobs(db: Session, run_month: str, limit: int = 20):
+    jobs = (
+        db.query(PipelineJob)
+        .options(selectinload(PipelineJob.stages))
+        .filter(PipelineJob.run_month == run_month)
+        .order_by(PipelineJob.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_job_payload(job) for job in jobs]
@@ -1,11 +1,239 @@
+from typing import Optional
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-import statistics
+import numpy as np
 
+from backend.app.db.upsert import bulk_upsert
 from backend.app.models.employee import Employee
 from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.models.quadrant_cutoff import QuadrantCutoff
+
+
+# Index = quadrant code used by the array classifier
+QUADRANTS = ["HIGH_VALUE", "STAR", "OVERPAID", "UNDERUTILIZED"]
+QUADRANT_LABELS = np.array(QUADRANTS)
+
+
+def _median(values: np.ndarray) -> float:
+    """Median by selection (np.partition), no full sort."""
+    n = values.size
+    mid = n // 2
+    if n % 2:
+        return float(np.partition(values, mid)[mid])
+    lower, upper = np.partition(values, [mid - 1, mid])[[mid - 1, mid]]
+    return float((lower + upper) / 2)
+
+
+def _group_medians(values: np.ndarray, group_idx: np.ndarray, n_groups: int) -> np.ndarray:
+    """Median per group in one sort: order by (group, value), then pick the middle of each run."""
+    order = np.argsort(values)
+    # Stable sort on the small integer group keys (radix) keeps values ordered within each group
+    order = order[np.argsort(group_idx[order], kind="stable")]
+    ordered = values[order]
+    counts = np.bincount(group_idx, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    lower = ordered[np.minimum(starts + (counts - 1) // 2, values.size - 1)]
+    upper = ordered[np.minimum(starts + counts // 2, values.size - 1)]
+    return np.where(counts > 0, (lower + upper) / 2, np.nan)
+
+
+def classify_quadrant_arrays(
+    hourly_rate: np.ndarray,
+    efficiency_score: np.ndarray,
+    dept_idx: Optional[np.ndarray] = None,
+    n_departments: int = 0,
+    per_department: bool = False,
+):
+    """
+    Vectorized quadrant pass over one month.
+
+    Codes index QUADRANTS: low cost and efficient -> HIGH_VALUE (0),
+    high cost and efficient -> STAR (1), high cost and inefficient ->
+    OVERPAID (2), low cost and inefficient -> UNDERUTILIZED (3).
+    Cost ties at the median count as low cost, efficiency ties as efficient.
+
+    With per_department the medians are taken within each department
+    (dept_idx required) and the cutoffs come back as per-department arrays.
+    When dept_idx is given, counts is an (n_departments, 4) matrix.
+    """
+    if per_department:
+        cost_cutoff = _group_medians(hourly_rate, dept_idx, n_departments)
+        efficiency_cutoff = _group_medians(efficiency_score, dept_idx, n_departments)
+        low_cost = hourly_rate <= cost_cutoff[dept_idx]
+        efficient = efficiency_score >= efficiency_cutoff[dept_idx]
+    else:
+        cost_cutoff = _median(hourly_rate)
+        efficiency_cutoff = _median(efficiency_score)
+        low_cost = hourly_rate <= cost_cutoff
+        efficient = efficiency_score >= efficiency_cutoff
+
+    inefficient = ~efficient
+    codes = (2 * inefficient + (inefficient ^ ~low_cost)).astype(np.int8)
+
+    counts = None
+    if dept_idx is not None:
+        counts = np.bincount(
+            dept_idx * len(QUADRANTS) + codes,
+            minlength=n_departments * len(QUADRANTS),
+        ).reshape(n_departments, len(QUADRANTS))
+
+    return codes, cost_cutoff, efficiency_cutoff, counts
+
+
+def assign_quadrants(hourly_rate: np.ndarray, efficiency_score: np.ndarray):
+    """
+    Splits a month on the cost and efficiency medians.
+    Returns (quadrant label per row, cost_median, efficiency_median).
+    """
+    codes, cost_median, efficiency_median, _ = classify_quadrant_arrays(
+        hourly_rate, efficiency_score
+    )
+    return QUADRANT_LABELS[codes], cost_median, efficiency_median
+
+
+def save_quadrant_cutoffs(db: Session, run_month: str, cost_median: float, efficiency_median: float):
+    bulk_upsert(
+        db,
+        QuadrantCutoff.__table__,
+        [{
+            "run_month": run_month,
+            "cost_median": cost_median,
+            "efficiency_median": efficiency_median,
+        }],
+        index_elements=["run_month"],
+        update_columns=["cost_median", "efficiency_median"],
+    )
+
+
+def store_month_quadrants(db: Session, run_month: str):
+    """
+    (Re)classifies every metric row of run_month and stores the result.
+    Used for months whose metrics were written before quadrants were
+    stored; the metrics stage classifies inline. The caller commits.
+    """
+    rows = (
+        db.query(EmployeeMetric.id, EmployeeMetric.hourly_rate, EmployeeMetric.efficiency_score)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .all()
+    )
+    if not rows:
+        return
+
+    quadrant, cost_median, efficiency_median = assign_quadrants(
+        np.array([r.hourly_rate for r in rows], dtype=np.float64),
+        np.array([r.efficiency_score for r in rows], dtype=np.float64),
+    )
+
+    db.execute(
+        update(EmployeeMetric),
+        [{"id": r.id, "quadrant": q} for r, q in zip(rows, quadrant.tolist())],
+    )
+    save_quadrant_cutoffs(db, run_month, cost_median, efficiency_median)
+
+
+def ensure_month_quadrants(db: Session, run_month: str):
+    """
+    Backfills stored quadrants for run_month if any rated row is missing
+    one. The caller commits; uncommitted, the backfill still serves the
+    current transaction.
+    """
+    missing = (
+        db.query(EmployeeMetric.id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.quadrant.is_(None),
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .first()
+    )
+    if missing is not None:
+        store_month_quadrants(db, run_month)
+
+
+def get_quadrant_cutoffs(db: Session, run_month: str) -> Optional[QuadrantCutoff]:
+    return (
+        db.query(QuadrantCutoff)
+        .filter(QuadrantCutoff.run_month == run_month)
+        .first()
+    )
+
+
+def _classify_per_department(db: Session, run_month: str):
+    rows = (
+        db.query(
+            Employee.id,
+            Employee.name,
+            Employee.department,
+            EmployeeMetric.hourly_rate,
+            EmployeeMetric.efficiency_score,
+        )
+        .join(Employee, Employee.id == EmployeeMetric.employee_id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .all()
+    )
+
+    if not rows:
+        return {"run_month": run_month, "cutoffs": {}, "employees": []}
+
+    codes_by_dept = {}
+    dept_idx = np.array(
+        [codes_by_dept.setdefault(r.department, len(codes_by_dept)) for r in rows],
+        dtype=np.int64,
+    )
+    hourly_rate = np.array([r.hourly_rate for r in rows], dtype=np.float64)
+    efficiency_score = np.array([r.efficiency_score for r in rows], dtype=np.float64)
+
+    codes, cost_cutoff, efficiency_cutoff, counts = classify_quadrant_arrays(
+        hourly_rate,
+        efficiency_score,
+        dept_idx=dept_idx,
+        n_departments=len(codes_by_dept),
+        per_department=True,
+    )
+
+    labels = QUADRANT_LABELS[codes].tolist()
+    return {
+        "run_month": run_month,
+        "cutoffs": {
+            dept: {
+                "cost_median": round(float(cost_cutoff[i]), 2),
+                "efficiency_median": round(float(efficiency_cutoff[i]), 2),
+                "quadrants": dict(zip(QUADRANTS, counts[i].tolist())),
+            }
+            for dept, i in codes_by_dept.items()
+        },
+        "employees": [
+            {
+                "employee_id": r.id,
+                "name": r.name,
+                "department": r.department,
+                "hourly_rate": round(r.hourly_rate, 2),
+                "efficiency_score": round(r.efficiency_score, 2),
+                "quadrant": label,
+            }
+            for r, label in zip(rows, labels)
+        ],
+    }
 
 
-def classify_employee_quadrants(db: Session, run_month: str):
+def classify_employee_quadrants(db: Session, run_month: str, per_department: bool = False):
+    """
+    Month-wide quadrants come from the values stored by the metrics stage.
+    per_department classifies on the fly against each department's own
+    medians; cutoffs are then keyed by department. Reads only; nothing is
+    written.
+    """
+    if per_department:
+        return _classify_per_department(db, run_month)
+
     rows = (
         db.query(
             Employee.id,
@@ -13,9 +241,13 @@ def classify_employee_quadrants(db: Session, run_month: str):
             Employee.department,
             EmployeeMetric.hourly_rate,
             EmployeeMetric.efficiency_score,
+            EmployeeMetric.quadrant,
         )
         .join(Employee, Employee.id == EmployeeMetric.employee_id)
-        .filter(EmployeeMetric.run_month == run_month)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
         .all()
     )
 
@@ -26,32 +258,31 @@ def classify_employee_quadrants(db: Session, run_month: str):
             "employees": []
         }
 
-    hourly_rates = [r.hourly_rate for r in rows]
-    efficiency_scores = [r.efficiency_score for r in rows]
+    cutoffs = get_quadrant_cutoffs(db, run_month)
+    quadrants = [r.quadrant for r in rows]
 
-    cost_median = statistics.median(hourly_rates)
-    efficiency_median = statistics.median(efficiency_scores)
-
-    results = []
-
-    for r in rows:
-        if r.hourly_rate <= cost_median and r.efficiency_score >= efficiency_median:
-            quadrant = "HIGH_VALUE"
-        elif r.hourly_rate > cost_median and r.efficiency_score >= efficiency_median:
-            quadrant = "STAR"
-        elif r.hourly_rate > cost_median and r.efficiency_score < efficiency_median:
-            quadrant = "OVERPAID"
-        else:
-            quadrant = "UNDERUTILIZED"
+    # Months written before quadrants were stored are classified in memory;
+    # backfill_rollups.py stores them
+    if cutoffs is None or any(q is None for q in quadrants):
+        labels, cost_median, efficiency_median = assign_quadrants(
+            np.array([r.hourly_rate for r in rows], dtype=np.float64),
+            np.array([r.efficiency_score for r in rows], dtype=np.float64),
+        )
+        quadrants = labels.tolist()
+    else:
+        cost_median, efficiency_median = cutoffs.cost_median, cutoffs.efficiency_median
 
-        results.append({
+    results = [
+        {
             "employee_id": r.id,
             "name": r.name,
             "department": r.department,
             "hourly_rate": round(r.hourly_rate, 2),
             "efficiency_score": round(r.efficiency_score, 2),
             "quadrant": quadrant,
-        })
+        }
+        for r, quadrant in zip(rows, quadrants)
+    ]
 
     return {
         "run_month": run_month,
@@ -0,0 +1,236 @@
+from collections import Counter
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+import numpy as np
+
+from backend.app.models.employee import Employee
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.models.payroll import PayrollEntry, PayrollRun
+from backend.app.models.department_metric_rollup import DepartmentMetricRollup
+from backend.app.services.quadrant_service import assign_quadrants, ensure_month_quadrants
+
+
+QUADRANT_COLUMNS = {
+    "HIGH_VALUE": "high_value_count",
+    "STAR": "star_count",
+    "OVERPAID": "overpaid_count",
+    "UNDERUTILIZED": "underutilized_count",
+}
+
+
+def _payroll_totals(db: Session, run_month: str):
+    """
+    department -> (gross, net) over every payroll run of the month (base
+    and adjustments). Driven from payroll_runs so entries are read through
+    ix_payroll_entries_run_employee rather than scanned per employee.
+    """
+    return {
+        dept: (gross, net)
+        for dept, gross, net in (
+            db.query(
+                Employee.department,
+                func.sum(PayrollEntry.gross_pay),
+                func.sum(PayrollEntry.net_pay),
+            )
+            .select_from(PayrollEntry)
+            .join(Employee, Employee.id == PayrollEntry.employee_id)
+            .filter(
+                PayrollEntry.payroll_run_id.in_(
+                    select(PayrollRun.id).where(PayrollRun.run_month == run_month)
+                )
+            )
+            .group_by(Employee.department)
+            .all()
+        )
+    }
+
+
+def refresh_rollup_payroll_totals(db: Session, run_month: str):
+    """
+    Updates only the payroll totals of existing rollups, after a payroll
+    or adjustment run. Months without rollups are left to the metrics
+    stage. The caller commits.
+    """
+    rollups = (
+        db.query(DepartmentMetricRollup.id, DepartmentMetricRollup.department)
+        .filter(DepartmentMetricRollup.run_month == run_month)
+        .all()
+    )
+    if not rollups:
+        return
+
+    payroll_totals = _payroll_totals(db, run_month)
+
+    updates = []
+    for rollup_id, dept in rollups:
+        gross, net = payroll_totals.get(dept, (0.0, 0.0))
+        updates.append({
+            "id": rollup_id,
+            "total_gross_pay": float(gross or 0.0),
+            "total_net_pay": float(net or 0.0),
+        })
+    db.execute(update(DepartmentMetricRollup), updates)
+
+
+def _staffing_totals(db: Session, run_month: str):
+    """
+    department -> (headcount, base salary) over every employee of the
+    month, rated or not. Served by ix_employees_month_department.
+    """
+    return {
+        dept: (count, salary)
+        for dept, count, salary in (
+            db.query(
+                Employee.department,
+                func.count(Employee.id),
+                func.sum(Employee.base_salary),
+            )
+            .filter(Employee.run_month == run_month)
+            .group_by(Employee.department)
+            .all()
+        )
+    }
+
+
+def _build_department_rollups(db: Session, run_month: str) -> list[dict]:
+    """
+    Department rollup rows for run_month from employee_metrics, employees
+    and payroll_entries. Reads only; nothing is written.
+
+    headcount and total_base_salary cover the whole department; the
+    efficiency and hourly figures and the quadrant counts cover the
+    rated_count employees that have an hourly rate.
+    """
+    rows = (
+        db.query(
+            Employee.department,
+            EmployeeMetric.efficiency_score,
+            EmployeeMetric.hourly_rate,
+            EmployeeMetric.quadrant,
+        )
+        .join(Employee, Employee.id == EmployeeMetric.employee_id)
+        .filter(
+            EmployeeMetric.run_month == run_month,
+            EmployeeMetric.hourly_rate.isnot(None),
+        )
+        .order_by(Employee.department)
+        .all()
+    )
+
+    if not rows:
+        return []
+
+    payroll_totals = _payroll_totals(db, run_month)
+    staffing_totals = _staffing_totals(db, run_month)
+
+    departments = [r[0] for r in rows]
+    values = np.array([r[1:3] for r in rows], dtype=np.float64)
+    quadrants = [r[3] for r in rows]
+
+    # Months written before quadrants were stored are classified in memory
+    if any(q is None for q in quadrants):
+        labels, _, _ = assign_quadrants(values[:, 1], values[:, 0])
+        quadrants = labels.tolist()
+
+    # Rows are sorted by department, so each group is a contiguous slice
+    boundaries = [0] + [
+        i for i in range(1, len(departments))
+        if departments[i] != departments[i - 1]
+    ] + [len(departments)]
+
+    rollups = []
+    for start, stop in zip(boundaries, boundaries[1:]):
+        dept = departments[start]
+        efficiency = values[start:stop, 0]
+        hourly = values[start:stop, 1]
+        p10, median, p90 = np.percentile(efficiency, [10, 50, 90])
+        headcount, base_salary = staffing_totals.get(dept, (0, 0.0))
+        gross, net = payroll_totals.get(dept, (0.0, 0.0))
+        quadrant_counts = Counter(quadrants[start:stop])
+
+        rollups.append({
+            "run_month": run_month,
+            "department": dept,
+            "headcount": int(headcount),
+            "rated_count": int(stop - start),
+            "avg_efficiency": float(efficiency.mean()),
+            "median_efficiency": float(median),
+            "p10_efficiency": float(p10),
+            "p90_efficiency": float(p90),
+            "avg_hourly_rate": float(hourly.mean()),
+            "total_base_salary": float(base_salary or 0.0),
+            "total_gross_pay": float(gross or 0.0),
+            "total_net_pay": float(net or 0.0),
+            **{
+                column: quadrant_counts.get(quadrant, 0)
+                for quadrant, column in QUADRANT_COLUMNS.items()
+            },
+        })
+
+    return rollups
+
+
+def refresh_department_rollups(db: Session, run_month: str):
+    """
+    Rebuilds department_metric_rollups for run_month. Used by the metrics
+    stage and backfill_rollups.py. Idempotent; the caller commits.
+    """
+    # Months written before quadrants were stored get them first
+    ensure_month_quadrants(db, run_month)
+
+    db.query(DepartmentMetricRollup).filter(
+        DepartmentMetricRollup.run_month == run_month
+    ).delete(synchronize_session=False)
+
+    rollups = _build_department_rollups(db, run_month)
+    if rollups:
+        db.execute(DepartmentMetricRollup.__table__.insert(), rollups)
+
+
+def get_department_rollups(db: Session, run_month: str):
+    """
+    All department rollups for run_month. A month without stored rollups
+    (produced before rollups existed) is computed on the fly and not
+    persisted; backfill_rollups.py stores them.
+    """
+    rollups = (
+        db.query(DepartmentMetricRollup)
+        .filter(DepartmentMetricRollup.run_month == run_month)
+        .order_by(DepartmentMetricRollup.department)
+        .all()
+    )
+
+    if not rollups:
+        rollups = [
+            DepartmentMetricRollup(**row)
+            for row in _build_department_rollups(db, run_month)
+        ]
+
+    return rollups
+
+
+def get_department_rollup(db: Session, department: str, run_month: str):
+    rollup = (
+        db.query(DepartmentMetricRollup)
+        .filter(
+            DepartmentMetricRollup.run_month == run_month,
+            DepartmentMetricRollup.department == department,
+        )
+        .first()
+    )
+
+    if rollup is None:
+        rollup = next(
+            (r for r in get_department_rollups(db, run_month) if r.department == department),
+            None,
+        )
+
+    return rollup
+
+
+def quadrant_percentages(rollup: DepartmentMetricRollup):
+    return {
+        quadrant: round(getattr(rollup, column) / rollup.rated_count * 100, 1)
+        for quadrant, column in QUADRANT_COLUMNS.items()
+    }
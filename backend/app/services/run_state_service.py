@@ -4,6 +4,9 @@ from backend.app.models.employee_metric import EmployeeMetric
 from sqlalchemy.orm import Session
 from backend.app.api.routes.run_state import RunState
 from backend.app.models.payroll import PayrollRun
+from backend.app.services.analytics_cache import invalidate_run_month
+from backend.app.services.ai_pregeneration_service import enqueue_ai_pregeneration
+from backend.app.core.config import settings
 
 
 
@@ -18,6 +21,7 @@ def upsert_run_state(db, run_month, **flags):
         setattr(state, key, value)
 
     db.commit()
+    invalidate_run_month(run_month)
     return state
 
 
@@ -29,6 +33,9 @@ def mark_payroll_done(db, run_month):
 
 def mark_metrics_done(db, run_month):
     upsert_run_state(db, run_month, metrics_done=True)
+    # Warm the AI cache before managers open the review screens
+    if settings.AI_PREGENERATE_ON_METRICS:
+        enqueue_ai_pregeneration(run_month)
 
 def validate_run_ready(db, run_month):
     state = db.query(RunState).filter_by(run_month=run_month).first()
@@ -0,0 +1,173 @@
+import numpy as np
+
+from backend.app.core.config import settings
+
+
+class TaxTableError(Exception):
+    pass
+
+
+# Table-driven payroll deductions, evaluated for a whole run as arrays.
+#
+# A tax table is a plain dict:
+#
+#     {
+#         "standard_hours": 160.0,
+#         "deductions": [ {rule}, ... ],   # applied in order
+#     }
+#
+# Each rule has a "name", a "type" and type-specific fields:
+#
+#     progressive  "brackets": [[lower_bound, marginal_rate], ...]
+#                  (ascending, first lower bound 0)
+#     flat         "rate"
+#     fixed        "amount"
+#
+# Common optional fields:
+#
+#     base        "gross" (default) or "taxable" (gross minus pre_tax rules)
+#     pre_tax     amount reduces the taxable base of later rules
+#     wage_cap    only this much of the base is subject to the rule
+#     max_amount  ceiling on the computed deduction
+#     prorate     thresholds, caps and fixed amounts scale with
+#                 working_hours / standard_hours (capped at 1)
+#
+# Monthly bounds throughout. Tables are registered by name in TAX_TABLES;
+# settings.PAYROLL_TAX_TABLE selects the one payroll runs use.
+DEFAULT_TAX_TABLE = {
+    "standard_hours": 160.0,
+    "deductions": [
+        {
+            "name": "pension",
+            "type": "flat",
+            "rate": 0.05,
+            "max_amount": 600.0,
+            "pre_tax": True,
+            "prorate": True,
+        },
+        {
+            "name": "income_tax",
+            "type": "progressive",
+            "base": "taxable",
+            "brackets": [
+                [0.0, 0.0],
+                [1000.0, 0.10],
+                [3500.0, 0.20],
+                [7500.0, 0.30],
+                [15000.0, 0.40],
+            ],
+            "prorate": True,
+        },
+        {
+            "name": "social_security",
+            "type": "flat",
+            "rate": 0.062,
+            "wage_cap": 14000.0,
+        },
+        {
+            "name": "health_insurance",
+            "type": "fixed",
+            "amount": 120.0,
+            "prorate": True,
+        },
+    ],
+}
+
+TAX_TABLES = {
+    "default": DEFAULT_TAX_TABLE,
+}
+
+
+def register_tax_table(name: str, table: dict) -> None:
+    validate_tax_table(table)
+    TAX_TABLES[name] = table
+
+
+def get_tax_table(name: str = None) -> dict:
+    name = name or settings.PAYROLL_TAX_TABLE
+    table = TAX_TABLES.get(name)
+    if table is None:
+        raise TaxTableError(f"Unknown tax table: {name}")
+    return table
+
+
+def validate_tax_table(table: dict) -> None:
+    if table.get("standard_hours", 0) <= 0:
+        raise TaxTableError("standard_hours must be positive")
+
+    for rule in table.get("deductions", []):
+        kind = rule.get("type")
+        if kind == "progressive":
+            lowers = [b[0] for b in rule.get("brackets", [])]
+            if not lowers or lowers[0] != 0 or any(b <= a for a, b in zip(lowers, lowers[1:])):
+                raise TaxTableError(
+                    f"{rule.get('name')}: brackets must start at 0 and be strictly ascending"
+                )
+        elif kind not in ("flat", "fixed"):
+            raise TaxTableError(f"{rule.get('name')}: unknown deduction type {kind!r}")
+
+
+def _progressive(base: np.ndarray, brackets: list, scale: np.ndarray) -> np.ndarray:
+    """
+    Marginal-rate tax via one searchsorted over the bracket lower bounds.
+    Prorated brackets are handled by homogeneity: tax(x; s*bounds) =
+    s * tax(x/s; bounds), so every row shares the same bound array.
+    """
+    lowers = np.array([b[0] for b in brackets], dtype=np.float64)
+    rates = np.array([b[1] for b in brackets], dtype=np.float64)
+    # Tax owed at the start of each bracket
+    base_tax = np.concatenate(([0.0], np.cumsum(np.diff(lowers) * rates[:-1])))
+
+    scaled = base / scale
+    idx = np.searchsorted(lowers, scaled, side="right") - 1
+    idx = np.clip(idx, 0, None)
+    return (base_tax[idx] + (scaled - lowers[idx]) * rates[idx]) * scale
+
+
+def compute_deductions(
+    gross: np.ndarray,
+    working_hours: np.ndarray,
+    table: dict = None,
+):
+    """
+    Returns (net, {rule name: deduction array}) for a whole run.
+    Deductions never take net pay below zero.
+    """
+    table = table or get_tax_table()
+
+    gross = np.where(np.isfinite(gross), gross, 0.0).clip(min=0.0)
+    hours = np.where(np.isfinite(working_hours) & (working_hours > 0), working_hours, table["standard_hours"])
+    fraction = np.minimum(hours / table["standard_hours"], 1.0)
+    ones = np.ones_like(gross)
+
+    taxable = gross.copy()
+    deductions = {}
+
+    for rule in table["deductions"]:
+        scale = fraction if rule.get("prorate") else ones
+        base = taxable if rule.get("base") == "taxable" else gross
+
+        if "wage_cap" in rule:
+            base = np.minimum(base, rule["wage_cap"] * scale)
+
+        kind = rule["type"]
+        if kind == "progressive":
+            amount = _progressive(base, rule["brackets"], scale)
+        elif kind == "flat":
+            amount = base * rule["rate"]
+        else:
+            amount = rule["amount"] * scale
+            amount = np.minimum(amount, base)
+
+        if "max_amount" in rule:
+            amount = np.minimum(amount, rule["max_amount"] * scale)
+
+        amount = np.round(amount, 2)
+        deductions[rule["name"]] = amount
+
+        if rule.get("pre_tax"):
+            taxable = np.maximum(taxable - amount, 0.0)
+
+    total = np.sum(list(deductions.values()), axis=0) if deductions else np.zeros_like(gross)
+    net = np.round(np.maximum(gross - total, 0.0), 2)
+    return net, deductions
@@ -0,0 +1,42 @@
+import os
+import sys
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.rollup_service import refresh_department_rollups
+
+# Load .env from backend directory or parent
+load_dotenv('../.env')
+load_dotenv('.env')
+
+db_url = os.getenv("DATABASE_URL")
+if not db_url:
+    print("DATABASE_URL not found")
+    sys.exit(1)
+
+engine = create_engine(db_url)
+Session = sessionmaker(bind=engine)
+
+
+def backfill_rollups():
+    """Builds department_metric_rollups for every month that has metrics."""
+    db = Session()
+    try:
+        months = [
+            m for (m,) in db.query(EmployeeMetric.run_month)
+            .distinct()
+            .order_by(EmployeeMetric.run_month)
+            .all()
+        ]
+        for run_month in months:
+            refresh_department_rollups(db, run_month)
+            db.commit()
+            print(f"Rollups refreshed for {run_month}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_rollups()
@@ -0,0 +1,5 @@
+import os
+
+# Benchmarks build their own scratch databases (common.make_session); keep
+# the app-level engine off any configured MySQL server as well.
+os.environ.setdefault("DATABASE_BACKEND", "sqlite")
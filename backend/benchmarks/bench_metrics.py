@@ -0,0 +1,89 @@
+"""
+Compares the vectorized generate_employee_metrics against the original
+per-employee loop.
+
+    python -m backend.benchmarks.bench_metrics 50000
+"""
+import sys
+
+from sqlalchemy import func
+
+from backend.app.models.employee import Employee
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.services.metrics_service import generate_employee_metrics
+from backend.benchmarks.common import make_session, seed_employees, timed
+
+
+def legacy_generate_employee_metrics(db, run_month: str):
+    """The pre-vectorized implementation, kept only as a benchmark baseline."""
+    employees = db.query(Employee).filter(Employee.run_month == run_month).all()
+
+    dept_avg = dict(
+        db.query(
+            Employee.department,
+            func.avg(Employee.base_salary / Employee.working_hours),
+        )
+        .filter(Employee.run_month == run_month)
+        .group_by(Employee.department)
+        .all()
+    )
+
+    hourly_rates = (
+        db.query(
+            Employee.id,
+            (Employee.base_salary / Employee.working_hours).label("hourly_rate"),
+        )
+        .filter(Employee.run_month == run_month)
+        .order_by("hourly_rate")
+        .all()
+    )
+    rate_rank = {emp_id: idx + 1 for idx, (emp_id, _) in enumerate(hourly_rates)}
+    total = len(hourly_rates)
+
+    for emp in employees:
+        hourly_rate = emp.base_salary / emp.working_hours
+        dept_avg_hourly = dept_avg.get(emp.department, hourly_rate)
+
+        existing = (
+            db.query(EmployeeMetric)
+            .filter(
+                EmployeeMetric.employee_id == emp.id,
+                EmployeeMetric.run_month == run_month,
+            )
+            .first()
+        )
+        if existing:
+            continue
+
+        db.add(EmployeeMetric(
+            employee_id=emp.id,
+            run_month=run_month,
+            hourly_rate=hourly_rate,
+            dept_avg_hourly=dept_avg_hourly,
+            peer_percentile=round((rate_rank[emp.id] / total) * 100, 2),
+            efficiency_score=round(hourly_rate / dept_avg_hourly, 2),
+        ))
+
+    db.commit()
+
+
+def main(n: int):
+    db = make_session()
+    seed_employees(db, "2000-01", n)
+    seed_employees(db, "2000-02", n)
+
+    results = {}
+    with timed(results, "legacy_loop"):
+        legacy_generate_employee_metrics(db, "2000-01")
+    with timed(results, "vectorized"):
+        generate_employee_metrics(db, "2000-02")
+    with timed(results, "vectorized_rerun"):
+        generate_employee_metrics(db, "2000-02")
+
+    for key, seconds in results.items():
+        print(f"{key:16s} {seconds:8.3f}s  {n / seconds:10.0f} employees/s")
+    print(f"speedup          {results['legacy_loop'] / results['vectorized']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
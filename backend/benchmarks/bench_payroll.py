@@ -0,0 +1,74 @@
+"""
+Compares the set-based run_payroll against the original per-employee ORM loop.
+
+    python -m backend.benchmarks.bench_payroll 50000
+"""
+import sys
+
+from backend.app.models.audit_log import AuditLog
+from backend.app.models.employee import Employee
+from backend.app.models.payroll import PayrollEntry, PayrollRun
+from backend.app.models.payslip import Payslip
+from backend.app.services.payroll_service import run_payroll
+from backend.benchmarks.common import make_session, seed_employees, timed
+
+
+def legacy_run_payroll(db, run_month: str, executed_by: str):
+    """The pre-bulk implementation, kept only as a benchmark baseline."""
+    employees = db.query(Employee).filter(Employee.run_month == run_month).all()
+
+    payroll_run = PayrollRun(run_month=run_month, status="PROCESSING")
+    db.add(payroll_run)
+    db.flush()
+
+    total_gross = 0.0
+    for emp in employees:
+        gross = emp.base_salary
+        net = gross
+        db.add(PayrollEntry(
+            payroll_run_id=payroll_run.id,
+            employee_id=emp.id,
+            gross_pay=gross,
+            net_pay=net,
+        ))
+        db.add(Payslip(
+            payslip_number=f"PS-{run_month}-{emp.id}",
+            employee_id=emp.id,
+            payroll_run_id=payroll_run.id,
+            run_month=run_month,
+            base_salary=emp.base_salary,
+            gross_pay=gross,
+            net_pay=net,
+            status="ISSUED",
+        ))
+        total_gross += gross
+
+    payroll_run.total_amount = total_gross
+    payroll_run.status = "COMPLETED"
+    db.add(AuditLog(
+        action="PAYROLL_EXECUTED",
+        performed_by=executed_by,
+        reference_id=payroll_run.id,
+    ))
+    db.commit()
+    return payroll_run.id
+
+
+def main(n: int):
+    db = make_session()
+    seed_employees(db, "2000-01", n)
+    seed_employees(db, "2000-02", n)
+
+    results = {}
+    with timed(results, "legacy_loop"):
+        legacy_run_payroll(db, "2000-01", "bench")
+    with timed(results, "bulk"):
+        run_payroll(db, "2000-02", "bench", generate_metrics=False)
+
+    for key, seconds in results.items():
+        print(f"{key:12s} {seconds:8.3f}s  {n / seconds:10.0f} employees/s")
+    print(f"speedup      {results['legacy_loop'] / results['bulk']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,79 @@
+"""
+Compares the array quadrant classifier against the original
+statistics.median / if-chain classification plus the per-employee
+department summary loop. Both run on the same in-memory month.
+
+    python -m backend.benchmarks.bench_quadrants 100000
+"""
+import statistics
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from backend.app.services.quadrant_service import QUADRANTS, classify_quadrant_arrays
+from backend.benchmarks.common import DEPARTMENTS, timed
+
+
+def legacy_classify_and_summarize(hourly_rates, efficiency_scores, departments):
+    """The pre-vectorized implementation, kept only as a benchmark baseline."""
+    cost_median = statistics.median(hourly_rates)
+    efficiency_median = statistics.median(efficiency_scores)
+
+    quadrants = []
+    for rate, eff in zip(hourly_rates, efficiency_scores):
+        if rate <= cost_median and eff >= efficiency_median:
+            quadrants.append("HIGH_VALUE")
+        elif rate > cost_median and eff >= efficiency_median:
+            quadrants.append("STAR")
+        elif rate > cost_median and eff < efficiency_median:
+            quadrants.append("OVERPAID")
+        else:
+            quadrants.append("UNDERUTILIZED")
+
+    dept_map = defaultdict(lambda: dict.fromkeys(QUADRANTS, 0))
+    for dept, quadrant in zip(departments, quadrants):
+        dept_map[dept][quadrant] += 1
+
+    return quadrants, dict(dept_map)
+
+
+def main(n: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    hourly_rate = np.round(rng.uniform(18.75, 125.0, n), 2)
+    efficiency_score = np.round(rng.lognormal(0.0, 0.25, n), 2)
+    dept_idx = np.arange(n) % len(DEPARTMENTS)
+
+    # The legacy path worked on Python lists of ORM rows
+    hourly_list = hourly_rate.tolist()
+    efficiency_list = efficiency_score.tolist()
+    department_list = [DEPARTMENTS[i] for i in dept_idx.tolist()]
+
+    results = {}
+    with timed(results, "legacy_loop"):
+        legacy_quadrants, legacy_counts = legacy_classify_and_summarize(
+            hourly_list, efficiency_list, department_list
+        )
+    with timed(results, "vectorized"):
+        codes, _, _, counts = classify_quadrant_arrays(
+            hourly_rate, efficiency_score, dept_idx=dept_idx, n_departments=len(DEPARTMENTS)
+        )
+    with timed(results, "per_department"):
+        classify_quadrant_arrays(
+            hourly_rate, efficiency_score,
+            dept_idx=dept_idx, n_departments=len(DEPARTMENTS), per_department=True,
+        )
+
+    assert [QUADRANTS[c] for c in codes.tolist()] == legacy_quadrants
+    assert all(
+        dict(zip(QUADRANTS, counts[i].tolist())) == legacy_counts[dept]
+        for i, dept in enumerate(DEPARTMENTS)
+    )
+
+    for key, seconds in results.items():
+        print(f"{key:16s} {seconds:8.4f}s  {n / max(seconds, 1e-9):12.0f} employees/s")
+    print(f"speedup          {results['legacy_loop'] / max(results['vectorized'], 1e-9):8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,78 @@
+"""
+Compares the array tax engine against a per-employee loop over the same
+tax table (bracket walk, caps and proration in plain Python).
+
+    python -m backend.benchmarks.bench_tax 100000
+"""
+import sys
+
+import numpy as np
+
+from backend.app.services.tax_engine import DEFAULT_TAX_TABLE, compute_deductions
+from backend.benchmarks.common import timed
+
+
+def legacy_net_pay(gross: float, working_hours: float, table: dict) -> float:
+    """Row-at-a-time reference implementation, kept only as a benchmark baseline."""
+    fraction = min(working_hours / table["standard_hours"], 1.0)
+    taxable = gross
+    total = 0.0
+
+    for rule in table["deductions"]:
+        scale = fraction if rule.get("prorate") else 1.0
+        base = taxable if rule.get("base") == "taxable" else gross
+        if "wage_cap" in rule:
+            base = min(base, rule["wage_cap"] * scale)
+
+        if rule["type"] == "progressive":
+            amount = 0.0
+            brackets = rule["brackets"]
+            for i, (lower, rate) in enumerate(brackets):
+                upper = brackets[i + 1][0] * scale if i + 1 < len(brackets) else float("inf")
+                lower *= scale
+                if base <= lower:
+                    break
+                amount += (min(base, upper) - lower) * rate
+        elif rule["type"] == "flat":
+            amount = base * rule["rate"]
+        else:
+            amount = min(rule["amount"] * scale, base)
+
+        if "max_amount" in rule:
+            amount = min(amount, rule["max_amount"] * scale)
+
+        amount = round(amount, 2)
+        total += amount
+        if rule.get("pre_tax"):
+            taxable = max(taxable - amount, 0.0)
+
+    return round(max(gross - total, 0.0), 2)
+
+
+def main(n: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    gross = np.round(rng.uniform(1500, 25000, n), 2)
+    working_hours = rng.choice([80.0, 120.0, 160.0, 160.0, 176.0], n)
+
+    gross_list = gross.tolist()
+    hours_list = working_hours.tolist()
+
+    results = {}
+    with timed(results, "legacy_loop"):
+        legacy = [
+            legacy_net_pay(g, h, DEFAULT_TAX_TABLE)
+            for g, h in zip(gross_list, hours_list)
+        ]
+    with timed(results, "vectorized"):
+        net, _ = compute_deductions(gross, working_hours, DEFAULT_TAX_TABLE)
+
+    mismatches = int(np.count_nonzero(np.abs(net - np.array(legacy)) > 0.011))
+    assert mismatches == 0, f"{mismatches} net pay mismatches"
+
+    for key, seconds in results.items():
+        print(f"{key:12s} {seconds:8.4f}s  {n / max(seconds, 1e-9):12.0f} employees/s")
+    print(f"speedup      {results['legacy_loop'] / max(results['vectorized'], 1e-9):8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,55 @@
+import os
+import random
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db.base import Base
+from backend.app.db.engine import create_app_engine
+import backend.app.models  # noqa: F401  (register all tables)
+from backend.app.models.employee import Employee
+
+DEPARTMENTS = ["Engineering", "Sales", "Product", "Marketing", "HR"]
+
+
+def make_session(url: str | None = None):
+    """
+    Returns a session bound to a scratch database with the full schema.
+    Defaults to in-memory SQLite; set BENCH_DATABASE_URL to use a file
+    database (sqlite:///bench.db) or MySQL.
+    """
+    url = url or os.getenv("BENCH_DATABASE_URL", "sqlite://")
+    engine = create_app_engine(url)
+
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def seed_employees(db, run_month: str, n: int, seed: int = 42):
+    rng = random.Random(seed)
+    db.execute(
+        insert(Employee),
+        [
+            {
+                "run_month": run_month,
+                "name": f"Employee {i:06d}",
+                "email": f"employee{i}@example.com",
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                "base_salary": round(rng.uniform(3000, 15000), 2),
+                "working_hours": rng.choice([120.0, 160.0, 160.0, 160.0]),
+                "is_active": True,
+                "simulate_failure": False,
+            }
+            for i in range(n)
+        ],
+    )
+    db.commit()
+
+
+@contextmanager
+def timed(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = round(time.perf_counter() - start, 4)
@@ -0,0 +1,137 @@
+"""
+Plan check for the hot analytic queries.
+
+Runs the main read paths against a generated org, captures every SELECT
+they issue and EXPLAINs it. Any full table scan fails the check (exit 1),
+so a dropped index or a rewritten query cannot silently fall back to
+scanning.
+
+    python -m backend.benchmarks.explain_plans
+    BENCH_DATABASE_URL=mysql+pymysql://... python -m backend.benchmarks.explain_plans
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event, text
+
+from backend.app.api.routes.employees import get_org_tree
+from backend.app.models.payroll import PayrollRun
+from backend.app.services.analytics_service import get_leaderboard
+from backend.app.services.department_insight_service import get_all_department_insights
+from backend.app.services.insight_service import get_employee_insights_batch
+from backend.app.services.payroll_service import (
+    get_payroll_run_entries,
+    get_payroll_run_entries_page,
+    get_payroll_run_summary,
+)
+from backend.app.services.payslip_export_service import iter_payslip_rows
+from backend.app.services.performance_service import get_performance_snapshot_page
+from backend.app.services.quadrant_service import classify_employee_quadrants
+from backend.app.services.rollup_service import refresh_department_rollups
+from backend.benchmarks.common import make_session
+from backend.benchmarks.synthetic_org import generate_org
+
+# Tables small enough (one row per month / run) that a scan is the right plan
+SCAN_ALLOWED = {"run_state", "payroll_runs", "department_metric_rollups"}
+
+
+@contextmanager
+def captured_selects(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _full_scans(conn, statement, parameters) -> list[str]:
+    """Tables read without an index, per the backend's EXPLAIN output."""
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        scans = []
+        for row in rows:
+            detail = row[-1]
+            # SEARCH seeks on a key; SCAN walks the whole table (or a whole index)
+            if detail.startswith("SCAN "):
+                scans.append(detail.split()[1])
+        return scans
+
+    if dialect == "mysql":
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        # ALL = table scan, index = full index scan
+        return [r["table"] for r in rows if r["type"] in ("ALL", "index")]
+
+    raise RuntimeError(f"EXPLAIN check not implemented for {dialect}")
+
+
+def check_plans(db) -> list[str]:
+    run_months = generate_org(db, employees=2000, months=3, start_month="2024-01")
+    run_month = run_months[-1]
+    run_id = (
+        db.query(PayrollRun.id)
+        .filter(PayrollRun.run_month == run_month)
+        .scalar()
+    )
+
+    with db.get_bind().connect() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+        else:
+            conn.execute(text("ANALYZE TABLE employees, employee_metrics, payroll_entries, performance_reviews"))
+        conn.commit()
+
+    hot_paths = {
+        "quadrants": lambda: classify_employee_quadrants(db, run_month),
+        "department_insights": lambda: list(get_all_department_insights(db, run_month)),
+        "employee_insights_batch": lambda: list(get_employee_insights_batch(db, run_month, department="Sales")),
+        "leaderboard": lambda: get_leaderboard(db, run_month, 10),
+        "rollup_refresh": lambda: refresh_department_rollups(db, run_month),
+        "payroll_summary": lambda: get_payroll_run_summary(db, run_id),
+        "payroll_entries": lambda: get_payroll_run_entries(db, run_id),
+        "payroll_entries_page": lambda: get_payroll_run_entries_page(db, run_id, ("Employee 001000", 0), 100),
+        "payslip_export": lambda: list(iter_payslip_rows(db, run_id)),
+        "performance_snapshots": lambda: get_performance_snapshot_page(db, 4, 2024, run_month=run_month),
+        "org_tree": lambda: get_org_tree(run_month=run_month, db=db),
+    }
+
+    failures = []
+    engine = db.get_bind()
+    for name, fn in hot_paths.items():
+        with captured_selects(engine) as statements:
+            fn()
+        db.rollback()
+
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                scans = [t for t in _full_scans(conn, statement, parameters) if t not in SCAN_ALLOWED]
+                if scans:
+                    failures.append(f"{name}: full scan of {', '.join(scans)}\n    {' '.join(statement.split())[:240]}")
+        print(f"{name:24s} {len(statements)} statement(s) checked")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="defaults to BENCH_DATABASE_URL / in-memory SQLite")
+    args = parser.parse_args()
+
+    failures = check_plans(make_session(args.url))
+    for line in failures:
+        print(f"FULL SCAN {line}")
+    if failures:
+        sys.exit(1)
+    print("no full scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Times the main hot paths across org sizes and writes a JSON report.
+
+Each size gets a fresh database holding `--history` months generated by
+synthetic_org, then one more month goes through the real pipeline:
+CSV upload ingestion -> run_payroll -> generate_employee_metrics, followed
+by the read paths (quadrants, department insights, org tree) and an
+adjustment run correcting 0.1% of the month.
+
+    python -m backend.benchmarks.suite --sizes 1000 10000 100000 --output bench-report.json
+    python -m backend.benchmarks.suite --baseline bench-report.json   # exits 1 on regression
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import sqlalchemy
+from sqlalchemy import func, update
+
+from backend.app.api.routes.employees import get_org_tree
+from backend.app.core.query_metrics import end_request, install_query_hooks, start_request
+from backend.app.models.employee import Employee
+from backend.app.services.department_insight_service import get_all_department_insights
+from backend.app.services.metrics_service import generate_employee_metrics
+from backend.app.services.payroll_ingest_service import ingest_payroll_csv
+from backend.app.services.payroll_service import run_payroll
+from backend.app.services.quadrant_service import classify_employee_quadrants
+from backend.benchmarks.common import DEPARTMENTS, make_session
+from backend.benchmarks.synthetic_org import generate_org, month_range
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_TOLERANCE = 0.25
+# Paths faster than this in the baseline are too noisy to flag
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+def _payroll_csv(n: int, seed: int = 7) -> bytes:
+    rng = np.random.default_rng(seed)
+    salary = rng.uniform(3000, 15000, n).round(2)
+    hours = rng.choice([120, 160, 160, 176], n)
+
+    out = io.StringIO()
+    out.write("name,email,department,base_salary,working_hours\n")
+    for i in range(n):
+        out.write(
+            f"Employee {i:07d},employee{i:07d}@example.com,"
+            f"{DEPARTMENTS[i % len(DEPARTMENTS)]},{salary[i]},{hours[i]}\n"
+        )
+    return out.getvalue().encode()
+
+
+@contextmanager
+def measured(results: dict, key: str, n: int):
+    """Wall time plus SQL statement count / DB time for one hot path."""
+    stats, token = start_request()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        end_request(token)
+        results[key] = {
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(n / seconds) if seconds else None,
+            "queries": stats.queries,
+            "db_time_ms": round(stats.db_time_ms, 2),
+        }
+
+
+def run_size(n: int, history: int, url: str | None = None) -> dict:
+    db = make_session(url)
+    install_query_hooks(db.get_bind())
+
+    results = {}
+    with measured(results, "generate_history", n * history):
+        months = generate_org(db, n, history, start_month="2024-01")
+
+    run_month = month_range(months[-1], 2)[1]
+    csv_bytes = _payroll_csv(n)
+
+    with measured(results, "upload_ingest", n):
+        ingest_payroll_csv(db, run_month, io.BytesIO(csv_bytes))
+    with measured(results, "run_payroll", n):
+        run_payroll(db, run_month, "bench", generate_metrics=False)
+    with measured(results, "generate_employee_metrics", n):
+        generate_employee_metrics(db, run_month)
+    with measured(results, "quadrant_classification", n):
+        classify_employee_quadrants(db, run_month)
+    with measured(results, "department_insights", n):
+        list(get_all_department_insights(db, run_month))
+    # Generated months carry the hierarchy; the uploaded one is flat
+    with measured(results, "org_tree", n):
+        get_org_tree(run_month=months[-1], db=db)
+
+    # Correction touching 0.1% of the month; the adjustment writes only those
+    changed = max(1, n // 1000)
+    first_id = (
+        db.query(func.min(Employee.id))
+        .filter(Employee.run_month == run_month)
+        .scalar()
+    )
+    db.execute(
+        update(Employee)
+        .where(Employee.run_month == run_month, Employee.id < first_id + changed)
+        .values(base_salary=Employee.base_salary + 100)
+    )
+    db.commit()
+    with measured(results, "payroll_adjustment", changed):
+        run_payroll(db, run_month, "bench", adjustment=True)
+
+    db.close()
+    db.get_bind().dispose()
+    return results
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Hot paths that got slower than baseline by more than `tolerance`."""
+    regressions = []
+    for size, paths in report["sizes"].items():
+        for path, result in paths.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(path)
+            if not old or old["seconds"] < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = result["seconds"] / old["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{size} {path}: {old['seconds']:.3f}s -> {result['seconds']:.3f}s ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--history", type=int, default=3, help="generated months before the benchmarked one")
+    parser.add_argument("--url", default=None, help="defaults to BENCH_DATABASE_URL / in-memory SQLite")
+    parser.add_argument("--output", default="bench-report.json")
+    parser.add_argument("--baseline", default=None, help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "numpy": np.__version__,
+            "database": (args.url or os.getenv("BENCH_DATABASE_URL", "sqlite://")).split("://")[0],
+        },
+        "history_months": args.history,
+        "sizes": {},
+    }
+
+    for n in args.sizes:
+        print(f"== {n} employees")
+        results = run_size(n, args.history, args.url)
+        report["sizes"][str(n)] = results
+        for path, r in results.items():
+            print(f"  {path:28s} {r['seconds']:9.3f}s  {r['queries']:7d} queries")
+
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"report written to {args.output}")
+
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Synthetic large-org generator: N employees x M monthly snapshots with a
+reporting hierarchy, employee metrics, completed payroll runs (entries +
+payslips) and quarterly performance reviews.
+
+Everything is written with executemany bulk inserts and explicit primary
+keys, so no per-row round trip is needed to learn generated ids.
+
+    python -m backend.benchmarks.synthetic_org --employees 10000 --months 24
+    BENCH_DATABASE_URL=sqlite:///org.db python -m backend.benchmarks.synthetic_org
+"""
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import func
+
+from backend.app.models.employee import Employee
+from backend.app.models.employee_metric import EmployeeMetric
+from backend.app.models.payroll import PayrollRun, PayrollEntry
+from backend.app.models.payslip import Payslip
+from backend.app.models.performance import PerformanceReview
+from backend.app.models.run_state import RunState
+from backend.app.services.metrics_service import compute_metric_arrays
+from backend.app.services.person_service import person_key_for_email
+from backend.app.services.rollup_service import refresh_department_rollups
+from backend.app.services.tax_engine import compute_deductions
+from backend.benchmarks.common import DEPARTMENTS, make_session
+
+# Direct reports per manager; depth grows as log_fanout(N)
+MANAGER_FANOUT = 8
+POSITION_LEVELS = ["Top", "Senior", "Middle"]  # deeper levels are Junior
+INSERT_BATCH_SIZE = 10000
+
+
+def month_range(start_month: str, months: int) -> list[str]:
+    year, month = map(int, start_month.split("-"))
+    out = []
+    for _ in range(months):
+        out.append(f"{year:04d}-{month:02d}")
+        month += 1
+        if month > 12:
+            month, year = 1, year + 1
+    return out
+
+
+def _next_id(db, column) -> int:
+    return (db.query(func.max(column)).scalar() or 0) + 1
+
+
+def _bulk_insert(db, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(model.__table__.insert(), rows[start:start + INSERT_BATCH_SIZE])
+
+
+def _org_shape(n: int):
+    """
+    Heap-shaped tree: person i reports to (i - 1) // MANAGER_FANOUT.
+    Returns (manager index or -1, depth) arrays.
+    """
+    idx = np.arange(n)
+    manager = np.where(idx > 0, (idx - 1) // MANAGER_FANOUT, -1)
+
+    depth = np.zeros(n, dtype=np.int64)
+    for i in range(1, n):
+        depth[i] = depth[manager[i]] + 1
+    return manager, depth
+
+
+def generate_org(
+    db,
+    employees: int,
+    months: int,
+    start_month: str = "2024-01",
+    seed: int = 42,
+    payroll: bool = True,
+    reviews: bool = True,
+):
+    """
+    Appends `months` monthly snapshots of an `employees`-person org.
+    Returns the list of generated run_months.
+    """
+    rng = np.random.default_rng(seed)
+    run_months = month_range(start_month, months)
+
+    manager_idx, depth = _org_shape(employees)
+    departments = [
+        DEPARTMENTS[0] if d == 0 else DEPARTMENTS[i % len(DEPARTMENTS)]
+        for i, d in enumerate(depth.tolist())
+    ]
+    levels = [
+        POSITION_LEVELS[d] if d < len(POSITION_LEVELS) else "Junior"
+        for d in depth.tolist()
+    ]
+    titles = {
+        "Top": "CEO",
+        "Senior": "Director",
+        "Middle": "Manager",
+        "Junior": "Individual Contributor",
+    }
+    emails = [f"employee{i:07d}@example.com" for i in range(employees)]
+    person_keys = [person_key_for_email(e) for e in emails]
+    names = [f"Employee {i:07d}" for i in range(employees)]
+
+    # Seniority premium plus per-person noise, then a small monthly drift
+    base_salary = (
+        rng.uniform(3000, 9000, employees)
+        * (1.0 + 0.6 / (1 + depth))
+    ).round(2)
+    working_hours = rng.choice([120.0, 160.0, 160.0, 160.0, 176.0], employees)
+
+    next_emp_id = _next_id(db, Employee.id)
+    next_run_id = _next_id(db, PayrollRun.id)
+
+    for month_no, run_month in enumerate(run_months):
+        ids = np.arange(next_emp_id, next_emp_id + employees)
+        next_emp_id += employees
+        manager_ids = np.where(manager_idx >= 0, ids[manager_idx], 0)
+
+        salary = (base_salary * (1 + 0.002 * month_no) * rng.normal(1.0, 0.01, employees)).round(2)
+        id_list = ids.tolist()
+        salary_list = salary.tolist()
+
+        # 1. Employees; managers precede their reports so the self-FK holds
+        _bulk_insert(db, Employee, [
+            {
+                "id": emp_id,
+                "run_month": run_month,
+                "name": names[i],
+                "email": emails[i],
+                "person_key": person_keys[i],
+                "department": departments[i],
+                "job_title": titles[levels[i]],
+                "base_salary": salary_list[i],
+                "working_hours": float(working_hours[i]),
+                "is_active": True,
+                "manager_id": int(manager_ids[i]) or None,
+                "position_level": levels[i],
+                "simulate_failure": False,
+            }
+            for i, emp_id in enumerate(id_list)
+        ])
+
+        # 2. Metrics, computed the same way the metrics stage does
+        hourly, dept_avg, percentile, efficiency = compute_metric_arrays(
+            departments, salary, working_hours
+        )
+        # Add performance noise so quadrants are not a pure function of pay
+        efficiency = (efficiency * rng.normal(1.0, 0.08, employees)).round(2)
+
+        _bulk_insert(db, EmployeeMetric, [
+            {
+                "employee_id": emp_id,
+                "run_month": run_month,
+                "person_key": person_keys[i],
+                "hourly_rate": hr,
+                "dept_avg_hourly": da,
+                "peer_percentile": pp,
+                "efficiency_score": eff,
+            }
+            for i, (emp_id, hr, da, pp, eff) in enumerate(zip(
+                id_list,
+                hourly.tolist(),
+                dept_avg.tolist(),
+                percentile.tolist(),
+                efficiency.tolist(),
+            ))
+        ])
+
+        # 3. Completed payroll run
+        if payroll:
+            net_list = compute_deductions(salary, working_hours)[0].tolist()
+            run_id = next_run_id
+            next_run_id += 1
+            _bulk_insert(db, PayrollRun, [{
+                "id": run_id,
+                "run_month": run_month,
+                "status": "COMPLETED",
+                "total_amount": float(salary.sum()),
+            }])
+            _bulk_insert(db, PayrollEntry, [
+                {
+                    "payroll_run_id": run_id,
+                    "employee_id": emp_id,
+                    "gross_pay": s,
+                    "net_pay": n,
+                }
+                for emp_id, s, n in zip(id_list, salary_list, net_list)
+            ])
+            _bulk_insert(db, Payslip, [
+                {
+                    "payslip_number": f"PS-{run_month}-{emp_id}",
+                    "employee_id": emp_id,
+                    "payroll_run_id": run_id,
+                    "run_month": run_month,
+                    "base_salary": s,
+                    "gross_pay": s,
+                    "net_pay": n,
+                    "status": "ISSUED",
+                }
+                for emp_id, s, n in zip(id_list, salary_list, net_list)
+            ])
+
+        # 4. Quarterly reviews, written by the manager in the quarter's last month
+        month = int(run_month[5:])
+        if reviews and month % 3 == 0:
+            ratings = np.clip(rng.normal(3.4, 0.8, employees), 1.0, 5.0).round(1)
+            _bulk_insert(db, PerformanceReview, [
+                {
+                    "employee_id": emp_id,
+                    # The root has no manager and signs off on itself
+                    "manager_id": int(manager_ids[i]) or emp_id,
+                    "quarter": month // 3,
+                    "year": int(run_month[:4]),
+                    "rating": r,
+                }
+                for i, (emp_id, r) in enumerate(zip(id_list, ratings.tolist()))
+            ])
+
+        refresh_department_rollups(db, run_month)
+        _bulk_insert(db, RunState, [{
+            "run_month": run_month,
+            "csv_uploaded": True,
+            "payroll_done": payroll,
+            "metrics_done": True,
+        }])
+        db.commit()
+
+    return run_months
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--start-month", default="2024-01")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", default=None, help="defaults to BENCH_DATABASE_URL / in-memory SQLite")
+    args = parser.parse_args()
+
+    db = make_session(args.url)
+    start = time.perf_counter()
+    run_months = generate_org(db, args.employees, args.months, args.start_month, args.seed)
+    elapsed = time.perf_counter() - start
+
+    rows = args.employees * len(run_months)
+    print(f"{rows} employee snapshots ({run_months[0]}..{run_months[-1]}) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
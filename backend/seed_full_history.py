@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
+from backend.app.services.person_service import person_key_for_email
+
 load_dotenv('.env')
 db_url = os.getenv("DATABASE_URL")
 engine = create_engine(db_url)
@@ -50,14 +52,14 @@ def seed_history():
                 email = name.lower().replace(" ", ".") + "@example.com"
                 
                 res = conn.execute(text("""
-                    INSERT INTO employees (run_month, name, email, department, job_title, base_salary, working_hours, is_active, simulate_failure)
-                    VALUES (:rm, :n, :e, :d, :j, :s, :h, 1, 0)
+                    INSERT INTO employees (run_month, name, email, person_key, department, job_title, base_salary, working_hours, is_active, simulate_failure)
+                    VALUES (:rm, :n, :e, :pk, :d, :j, :s, :h, 1, 0)
                 """), {
-                    "rm": run_month, "n": name, "e": email, "d": dept, 
+                    "rm": run_month, "n": name, "e": email, "pk": person_key_for_email(email), "d": dept, 
                     "j": "Staff" if i > 2 else "Lead", "s": base_salary, "h": 160
                 })
-                # For MySQL/SQLite, we can use LAST_INSERT_ID or just fetch the one we just made
-                eid = conn.execute(text("SELECT LAST_INSERT_ID()")).scalar()
+                # DBAPI lastrowid works on both MySQL and SQLite
+                eid = res.lastrowid
                 emp_records.append({"id": eid, "email": email, "name": name, "department": dept, "base_salary": base_salary})
 
             # 2. Build Hierarchy within this month
@@ -83,10 +85,10 @@ def seed_history():
                 hourly_rate = (50000 / 160) * growth_factor * random.uniform(0.9, 1.1)
                 
                 conn.execute(text("""
-                    INSERT INTO employee_metrics (employee_id, run_month, hourly_rate, dept_avg_hourly, peer_percentile, efficiency_score)
-                    VALUES (:eid, :rm, :hr, :da, :pp, :eff)
+                    INSERT INTO employee_metrics (employee_id, run_month, person_key, hourly_rate, dept_avg_hourly, peer_percentile, efficiency_score)
+                    VALUES (:eid, :rm, :pk, :hr, :da, :pp, :eff)
                 """), {
-                    "eid": rec["id"], "rm": run_month, "hr": hourly_rate, "da": dept_avgs[DEPARTMENTS[i%len(DEPARTMENTS)]], "pp": random.randint(10, 90), "eff": eff
+                    "eid": rec["id"], "rm": run_month, "pk": person_key_for_email(rec["email"]), "hr": hourly_rate, "da": dept_avgs[DEPARTMENTS[i%len(DEPARTMENTS)]], "pp": random.randint(10, 90), "eff": eff
                 })
 
             # 4. Mark State Ready